@@ -0,0 +1 @@
+"""Datos sintéticos y mediciones de rendimiento de cada etapa de EpidemioManager."""
@@ -0,0 +1,140 @@
+"""Mide tiempo y memoria pico de cada etapa con datos sintéticos y guarda los resultados en JSON.
+
+Uso:
+    python -m benchmarks.ejecutar --tamanos 100 1000 10000 --salida resultados.json
+    python -m benchmarks.ejecutar --comparar resultados_anteriores.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.generadores import aislamientos_csv, censo_html
+from nucleo.aislamientos import consolidar_aislamientos
+from nucleo.censo import leer_censo, tabla_epidemiologica
+from nucleo.especialidades import cargar_indice
+from nucleo.insumos import limpiar_aislamientos, mapear_aislamientos, pacientes_servicios, referencia_censo, tablas_servicios
+from nucleo.reportes import CACHE_SECCIONES, excel_censo, excel_insumos, pdf_insumos
+
+# --- CONFIGURACIÓN ---
+TAMANOS = [100, 1_000, 10_000, 100_000]
+ETAPAS = ["parseo", "especialidades", "consolidacion", "cruce", "excel_censo", "excel_insumos", "pdf"]
+UMBRAL_REGRESION = 1.25
+
+# --- MEDICIÓN ---
+
+def medir(funcion, repeticiones=3, memoria=True):
+    """Mejor tiempo de varias repeticiones y, aparte, el pico de memoria (tracemalloc distorsiona el tiempo)."""
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        t = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t)
+    pico = None
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            funcion()
+            pico = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return min(tiempos), pico
+
+def preparar(n, semilla=0):
+    """Datos de entrada y salidas intermedias para que cada etapa se mida por separado."""
+    datos = {"html": censo_html(n, semilla), "csv": aislamientos_csv(n, semilla)}
+    indice = cargar_indice()
+    datos["df_censo"] = leer_censo(datos["html"])
+    datos["df_pacs"] = datos["df_censo"].assign(ESP_REAL=indice.resolver_columna(datos["df_censo"]["CAMA"], datos["df_censo"]["ESP_HTML"]))
+    datos["df_ais"] = consolidar_aislamientos(datos["csv"])
+    datos["df_ref"] = referencia_censo(datos["df_censo"])
+    datos["df_ais_mapeado"] = mapear_aislamientos(limpiar_aislamientos(datos["df_ais"]), datos["df_ref"])
+    datos["servicios"] = tablas_servicios(pacientes_servicios(datos["df_ref"]))
+    datos["df_out"] = tabla_epidemiologica(datos["df_pacs"], set(datos["df_pacs"]["ESP_REAL"]), indice.orden_terapias)
+    return datos
+
+def _especialidades(df_censo):
+    # Índice nuevo en cada corrida: incluye el costo de llenar los memos
+    indice = cargar_indice()
+    indice.agrupar(set(indice.resolver_columna(df_censo["CAMA"], df_censo["ESP_HTML"])))
+
+def _pdf(datos):
+    # Renderizado en serie: sin el arranque del pool de procesos y con la memoria visible para tracemalloc
+    CACHE_SECCIONES.limpiar()
+    pdf_insumos(datos["df_ais_mapeado"], datos["servicios"], paralelo=False)
+
+def etapas(datos):
+    return {
+        "parseo": lambda: leer_censo(datos["html"]),
+        "especialidades": lambda: _especialidades(datos["df_censo"]),
+        "consolidacion": lambda: consolidar_aislamientos(datos["csv"]),
+        "cruce": lambda: mapear_aislamientos(limpiar_aislamientos(datos["df_ais"]), datos["df_ref"]),
+        "excel_censo": lambda: excel_censo(datos["df_out"]),
+        "excel_insumos": lambda: excel_insumos(datos["df_ais_mapeado"], datos["servicios"]),
+        "pdf": lambda: _pdf(datos),
+    }
+
+def ejecutar(tamanos=TAMANOS, seleccion=ETAPAS, repeticiones=3, memoria=True):
+    resultados = []
+    for n in tamanos:
+        datos = preparar(n)
+        for etapa, funcion in etapas(datos).items():
+            if etapa not in seleccion: continue
+            segundos, pico = medir(funcion, repeticiones, memoria)
+            resultados.append({"etapa": etapa, "n": n, "segundos": round(segundos, 4), "pico_mb": None if pico is None else round(pico, 2)})
+            print(f"{etapa:<15} n={n:<7} {segundos:9.4f} s   pico={'-' if pico is None else f'{pico:.1f} MB'}", flush=True)
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "maquina": platform.platform(),
+        "resultados": resultados,
+    }
+
+def comparar(actual, previo, umbral=UMBRAL_REGRESION):
+    """Regresiones de tiempo (actual / previo > umbral) por etapa y tamaño."""
+    base = {(r["etapa"], r["n"]): r for r in previo["resultados"]}
+    regresiones = []
+    for r in actual["resultados"]:
+        ant = base.get((r["etapa"], r["n"]))
+        if not ant or not ant["segundos"]: continue
+        razon = r["segundos"] / ant["segundos"]
+        marca = "⚠️" if razon > umbral else "  "
+        print(f"{marca} {r['etapa']:<15} n={r['n']:<7} {ant['segundos']:9.4f} s -> {r['segundos']:9.4f} s  (x{razon:.2f})")
+        if razon > umbral: regresiones.append({**r, "segundos_previos": ant["segundos"], "razon": round(razon, 2)})
+    return regresiones
+
+# --- ENTRADA DE LÍNEA DE COMANDOS ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ejecutar", description="Benchmarks por etapa de EpidemioManager.")
+    parser.add_argument("--tamanos", nargs="*", type=int, default=TAMANOS, help="Pacientes por corrida.")
+    parser.add_argument("--etapas", nargs="*", default=ETAPAS, choices=ETAPAS)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir memoria pico (más rápido).")
+    parser.add_argument("--salida", default=f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    parser.add_argument("--comparar", metavar="JSON_PREVIO", help="Resultados anteriores contra los cuales comparar.")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION, help="Razón de tiempo considerada regresión.")
+    args = parser.parse_args(argv)
+
+    actual = ejecutar(args.tamanos, args.etapas, args.repeticiones, not args.sin_memoria)
+    regresiones = []
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regresiones = comparar(actual, json.load(f), args.umbral)
+        actual["regresiones"] = regresiones
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(actual, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {args.salida}")
+    return 1 if regresiones else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
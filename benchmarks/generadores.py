@@ -0,0 +1,88 @@
+import csv
+import io
+import random
+from datetime import date, timedelta
+from html import escape
+
+from nucleo.especialidades import INDICE
+
+# --- CONFIGURACIÓN ---
+ESPECIALIDADES_HTML = sorted({kw for kws in INDICE.catalogo.values() for kw in kws} | {
+    "HEMATOLOGIA", "HEMATOLOGIA PEDIATRICA", "ONCOLOGIA PEDIATRICA", "ONCOLOGIA MEDICA",
+    "INFECTOLOGIA PEDIATRICA", "NEFROLOGIA", "MEDICINA INTERNA", "CIRUGIA GENERAL", "GINECOLOGIA",
+})
+
+# Prefijos con regla propia (terapias) más pisos generales y el rango 7401-7409
+PREFIJOS_CAMA = list(INDICE.prefijos_cama) + ["12", "23", "33", "41", "52", "61", "72", "81"]
+RUIDO = ["TOTAL DE PACIENTES: {n}", "SUBTOTAL {n}", "PÁGINA {n} DE 99", "FECHA DE IMPRESIÓN: 01/10/2026", "1111"]
+NOMBRES = ["JUAN", "MARÍA", "JOSÉ", "GUADALUPE", "LUIS", "ANA", "CARLOS", "SOFÍA", "MIGUEL", "LUCÍA"]
+APELLIDOS = ["PÉREZ", "LÓPEZ", "GARCÍA", "HERNÁNDEZ", "MARTÍNEZ", "GONZÁLEZ", "RODRÍGUEZ", "SÁNCHEZ", "RAMÍREZ", "NÚÑEZ"]
+DIAGNOSTICOS = ["NEUMONIA ADQUIRIDA EN LA COMUNIDAD", "INFECCION DE VIAS URINARIAS", "LEUCEMIA LINFOBLASTICA AGUDA",
+                "CHOQUE SEPTICO", "POSTOPERADO DE REVASCULARIZACION", "QUEMADURA DE SEGUNDO GRADO", "PREMATUREZ"]
+TIPOS_AISLAMIENTO = ["CONTACTO", "GOTAS", "AÉREO", "PROTECTOR", "CONTACTO ESPECIAL"]
+MICROORGANISMOS = ["KPC", "E. COLI BLEE", "C. DIFFICILE", "SARM", "INFLUENZA", ""]
+
+# --- UTILIDADES ---
+
+def _cama(r):
+    if r.random() < 0.05:
+        desde, hasta, _ = r.choice(INDICE.rangos)
+        return str(r.randint(desde, hasta))
+    return f"{r.choice(PREFIJOS_CAMA)}{r.randint(1, 40):02d}"
+
+def _nombre(r):
+    return f"{r.choice(APELLIDOS)} {r.choice(APELLIDOS)} {r.choice(NOMBRES)}"
+
+def registros(n, semilla=0):
+    """Los mismos REGISTRO que usa censo_html con la misma semilla (para probar el cruce)."""
+    return [str(100000 + semilla * 1_000_000 + k * 7) for k in range(n)]
+
+# --- CENSO HTML ---
+
+def censo_html(n, semilla=0, hoy=date(2026, 10, 1)):
+    """Censo como lo exporta el sistema del hospital: tabla de título, encabezados de especialidad,
+    filas de ruido (totales, paginación, 1111) y n pacientes."""
+    r = random.Random(semilla)
+    regs = registros(n, semilla)
+    partes = ["<html><head><meta charset='utf-8'></head><body>",
+              "<table><tr><td>CENTRO MÉDICO NACIONAL 20 DE NOVIEMBRE</td></tr><tr><td>CENSO DIARIO</td></tr></table>",
+              "<table><thead><tr>" + "".join(f"<th>{h}</th>" for h in [
+                  "CAMA", "REGISTRO", "NOMBRE", "SEXO", "EDAD", "TIPO", "DIAGNÓSTICO", "MÉDICO", "PISO", "INGRESO", "OBS"
+              ]) + "</tr></thead><tbody>"]
+    k = 0
+    while k < n:
+        esp = r.choice(ESPECIALIDADES_HTML)
+        partes.append(f"<tr><td colspan='11'>ESPECIALIDAD:&amp;nbsp;{escape(esp)}</td></tr>")
+        for _ in range(min(r.randint(5, 40), n - k)):
+            ingreso = hoy - timedelta(days=r.randint(0, 120))
+            f_ing = ingreso.strftime("%d/%m/%Y") if r.random() > 0.01 else "SIN FECHA"
+            celdas = [_cama(r), regs[k], _nombre(r), r.choice("MF"), f"{r.randint(0, 95)} AÑOS", "HOSP",
+                      r.choice(DIAGNOSTICOS), "DR. X", "", f_ing, ""]
+            partes.append("<tr>" + "".join(f"<td>{escape(c)}</td>" for c in celdas) + "</tr>")
+            k += 1
+        if r.random() < 0.3:
+            ruido = r.choice(RUIDO).format(n=r.randint(1, 99))
+            partes.append(f"<tr><td>{escape(ruido)}</td><td>{r.randint(10000, 99999)}</td>" + "<td></td>" * 9 + "</tr>")
+    partes.append("</tbody></table></body></html>")
+    return "".join(partes).encode("utf-8")
+
+# --- HOJA DE AISLAMIENTOS ---
+
+def aislamientos_csv(n, semilla=0, proporcion_censo=0.9, proporcion_terminados=0.25):
+    """CSV publicado de aislamientos: fila de título, encabezados B-J y pacientes de 1 a 3 filas
+    (las filas de continuación solo traen otro tipo de aislamiento / microorganismo)."""
+    r = random.Random(semilla + 1)
+    regs = registros(n, semilla)
+    salida = io.StringIO()
+    w = csv.writer(salida)
+    w.writerow(["CONTROL DE AISLAMIENTOS"] + [""] * 10)
+    w.writerow(["#", "CAMA", "REGISTRO", "NOMBRE", "EDAD", "SERVICIO", "TIPO DE AISLAMIENTO",
+                "MICROORGANISMO", "FECHA DE INICIO", "FECHA DE TÉRMINO", "OBSERVACIONES"])
+    for k in range(n):
+        reg = regs[k] if r.random() < proporcion_censo else str(900000 + k)
+        termino = "05/10/2026" if r.random() < proporcion_terminados else ""
+        w.writerow([k + 1, _cama(r), reg, _nombre(r), r.randint(0, 95), r.choice(ESPECIALIDADES_HTML),
+                    r.choice(TIPOS_AISLAMIENTO), r.choice(MICROORGANISMOS), "01/10/2026", termino, ""])
+        for _ in range(r.choice([0, 0, 0, 1, 2])):
+            w.writerow(["", "", "", "", "", "", r.choice(TIPOS_AISLAMIENTO), r.choice(MICROORGANISMOS), "", "", ""])
+    return salida.getvalue().encode("utf-8")
@@ -0,0 +1 @@
+"""Piezas de interfaz de Streamlit reutilizadas por varias páginas."""
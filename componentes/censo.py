@@ -0,0 +1,26 @@
+import streamlit as st
+
+from nucleo.censo import huella_censo, huella_censos, leer_censo, leer_censos
+
+# --- CONFIGURACIÓN ---
+MAX_CENSOS_EN_CACHE = 8
+
+# --- CENSO COMPARTIDO ENTRE SESIONES ---
+
+@st.cache_resource(max_entries=MAX_CENSOS_EN_CACHE, show_spinner="Procesando censo...")
+def _censo_cacheado(huella, _contenido):
+    # Solo la huella forma la llave; el contenido se excluye del hash de Streamlit (prefijo "_").
+    return leer_censo(_contenido)
+
+def cargar_censo(contenido, huella=None):
+    """Devuelve la tabla de pacientes compartida entre sesiones. ¡Tratarla como solo lectura!"""
+    return _censo_cacheado(huella or huella_censo(contenido), contenido)
+
+@st.cache_resource(max_entries=MAX_CENSOS_EN_CACHE, show_spinner="Procesando censos...")
+def _censos_cacheados(huella, _contenidos):
+    return leer_censos(_contenidos)
+
+def cargar_censos(contenidos, huella=None):
+    """Como `cargar_censo` para uno o varios archivos del mismo día (ver `unir_censos`)."""
+    if len(contenidos) == 1: return cargar_censo(contenidos[0], huella)
+    return _censos_cacheados(huella or huella_censos([huella_censo(c) for c in contenidos]), contenidos)
@@ -0,0 +1,20 @@
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# --- SESIÓN EN FRAGMENTOS ---
+
+def sesion_actual():
+    """Enlaza el Diagnostico de la sesión al hilo que corre el fragmento; llamar al inicio de cada fragmento.
+
+    Un rerun solo del fragmento corre en un hilo nuevo sin pasar por main.py, así que ahí se abre
+    una petición propia; dentro de un rerun completo se sigue en la petición que abrió main.py.
+    """
+    diagnostico = st.session_state.get('diagnostico')
+    if diagnostico is None:
+        return None
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run:
+        diagnostico.nueva_peticion(diagnostico.pagina)
+    else:
+        diagnostico.activar()
+    return diagnostico
@@ -0,0 +1,43 @@
+import streamlit as st
+
+# --- CONFIGURACIÓN ---
+FILAS_POR_PAGINA = [25, 50, 100]
+ALTO_FILA = 35
+
+# --- PAGINACIÓN (SERVIDOR) ---
+
+def paginar(df, pagina, por_pagina, orden=None, descendente=False):
+    """Filas de una página (empezando en 1), ordenadas en el servidor sin reordenar toda la tabla.
+
+    Devuelve (df_pagina, pagina_efectiva, total_paginas).
+    """
+    total = max(1, -(-len(df) // por_pagina))
+    pagina = min(max(1, int(pagina)), total)
+    inicio = (pagina - 1) * por_pagina
+    if orden in df.columns:
+        posiciones = df[orden].reset_index(drop=True).sort_values(ascending=not descendente, kind="stable", na_position="last").index
+        return df.take(posiciones[inicio:inicio + por_pagina]), pagina, total
+    return df.iloc[inicio:inicio + por_pagina], pagina, total
+
+# --- INTERFAZ ---
+
+def tabla_paginada(df, clave, por_pagina=FILAS_POR_PAGINA[0]):
+    """Tabla virtualizada que solo envía al navegador la página visible; orden y página viven en la sesión."""
+    if len(df) <= por_pagina:
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        return
+
+    c_orden, c_sentido, c_filas, c_pagina = st.columns([3, 2, 2, 2])
+    orden = c_orden.selectbox("Ordenar por", ["(original)"] + list(df.columns), key=f"{clave}_orden")
+    descendente = c_sentido.toggle("Descendente", key=f"{clave}_desc")
+    por_pagina = c_filas.selectbox("Filas", FILAS_POR_PAGINA, index=FILAS_POR_PAGINA.index(por_pagina) if por_pagina in FILAS_POR_PAGINA else 0, key=f"{clave}_filas")
+    total = max(1, -(-len(df) // por_pagina))
+    # Al cambiar filas por página o al achicarse la tabla, la página guardada puede quedar fuera de rango
+    if st.session_state.get(f"{clave}_pagina", 1) > total:
+        st.session_state[f"{clave}_pagina"] = total
+    pagina = c_pagina.number_input(f"Página (de {total})", min_value=1, max_value=total, step=1, key=f"{clave}_pagina")
+
+    df_pagina, pagina, total = paginar(df, pagina, por_pagina, orden, descendente)
+    st.dataframe(df_pagina, hide_index=True, use_container_width=True, height=ALTO_FILA * (len(df_pagina) + 1) + 3)
+    inicio = (pagina - 1) * por_pagina
+    st.caption(f"Filas {inicio + 1}–{inicio + len(df_pagina)} de {len(df)}")
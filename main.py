@@ -1,4 +1,9 @@
 import streamlit as st
+from componentes.censo import cargar_censos
+from nucleo.aislamientos import iniciar_sondeo, precargar_aislamientos
+from nucleo.censo import huella_censo, huella_censos
+from nucleo.diagnostico import Diagnostico, etapa
+from nucleo.memoria import reporte_sesion
 
 # --- CONFIGURACIÓN GLOBAL ---
 st.set_page_config(
@@ -8,18 +13,48 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- DIAGNÓSTICO (una bitácora por sesión, una petición por rerun) ---
+if 'diagnostico' not in st.session_state:
+    st.session_state['diagnostico'] = Diagnostico()
+diagnostico = st.session_state['diagnostico']
+diagnostico.memoria = st.session_state.get('diag_memoria', False)
+diagnostico.nueva_peticion()
+
+# Hilo de sondeo de la hoja de aislamientos (uno por proceso)
+iniciar_sondeo()
+
 # --- BARRA LATERAL (ORDEN SUPERIOR) ---
 st.sidebar.header("⚙️ Configuración")
 
-archivo_subido = st.sidebar.file_uploader(
+archivos_subidos = st.sidebar.file_uploader(
     "Subir Censo HTML", 
     type=["html", "htm"],
-    help="Arrastra aquí el archivo generado por el sistema del hospital."
+    accept_multiple_files=True,
+    help="Arrastra aquí el archivo generado por el sistema del hospital. Si el censo viene en varias partes (por torre o piso), súbelas todas: se unen por REGISTRO y, si un paciente se repite, gana el último archivo.",
 )
 
-if archivo_subido:
-    st.session_state['archivo_compartido'] = archivo_subido
-    st.sidebar.success("✅ Censo cargado")
+if archivos_subidos:
+    try:
+        # Se parsea una sola vez por contenido; las páginas reciben la misma tabla de pacientes
+        # (la sesión no guarda el HTML crudo, solo la tabla compacta compartida en caché)
+        with etapa("censo.cargar"):
+            contenidos = [a.getvalue() for a in archivos_subidos]
+            ids = [a.file_id for a in archivos_subidos]
+            if st.session_state.get('censo_file_id') != ids:
+                # Censo nuevo: la hoja de aislamientos se descarga mientras se parsea el HTML
+                precargar_aislamientos()
+                st.session_state.pop('df_ais_mapeado', None)
+                st.session_state['censo_file_id'] = ids
+                st.session_state['censo_huella'] = huella_censos([huella_censo(c) for c in contenidos])
+            st.session_state['df_censo'] = cargar_censos(contenidos, st.session_state['censo_huella'])
+        if len(archivos_subidos) > 1:
+            st.sidebar.success(f"✅ Censo cargado ({len(archivos_subidos)} archivos, {len(st.session_state['df_censo'])} pacientes)")
+        else:
+            st.sidebar.success("✅ Censo cargado")
+    except Exception as e:
+        st.session_state.pop('df_censo', None)
+        st.session_state.pop('censo_file_id', None)
+        st.sidebar.error(f"Error al leer el censo: {e}")
 else:
     st.sidebar.info("👋 Por favor, sube un censo.")
 
@@ -30,6 +65,28 @@ pg = st.navigation([
     st.Page("modulos/censo_diario.py", title="Censo Epidemiológico", icon="📋"),
     st.Page("modulos/insumos.py", title="Censo de Insumos", icon="📦"),
     st.Page("modulos/aislamientos.py", title="Aislamientos", icon="🦠"), # <--- Nueva pestaña
+    st.Page("modulos/historico.py", title="Histórico", icon="📈"),
 ])
 
-pg.run()
+# Panel al final de la barra lateral: se llena después de correr la página
+panel_diagnostico = st.sidebar.expander("🩺 Diagnóstico")
+panel_diagnostico.toggle("Medir memoria pico (más lento)", key="diag_memoria")
+panel_diagnostico.toggle("Memoria de la sesión", key="diag_sesion")
+tabla_diagnostico = panel_diagnostico.empty()
+
+diagnostico.pagina = pg.title
+with etapa("pagina"):
+    pg.run()
+
+registros = diagnostico.peticion()
+with tabla_diagnostico.container():
+    st.caption(f"Sesión `{diagnostico.id_sesion}` · petición {diagnostico.n_peticion}")
+    st.dataframe(
+        [{"Etapa": r["etapa"], "Segundos": r["segundos"], "Pico MB": r["pico_mb"]} for r in registros],
+        hide_index=True, use_container_width=True,
+    )
+    if st.session_state.get('diag_sesion'):
+        # df_censo vive en el caché del proceso y lo comparten todas las sesiones con el mismo archivo
+        df_mem = reporte_sesion(st.session_state.to_dict(), compartidos={'df_censo'})
+        st.caption(f"Propio de la sesión: {df_mem.loc[~df_mem['Compartido'], 'MB'].sum():.2f} MB")
+        st.dataframe(df_mem, hide_index=True, use_container_width=True)
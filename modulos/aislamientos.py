@@ -1,86 +1,69 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 
-st.title("🦠 Control de Aislamientos Activos")
-
-# --- CONFIGURACIÓN ---
-SHEET_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ8qN_ymtBcRCY2DcyEAANAzPPasVeYL6h0l4-AhuL2JYXpBOQ0e-mtrtoeSRvcnnl66HEh9aCJQwpx/pub?gid=0&single=true&output=csv"
-
-def cargar_aislamientos_definitivo():
-    # 1. Carga inicial saltando el título
-    df = pd.read_csv(SHEET_URL, skiprows=1, engine='python', encoding='utf-8')
-    
-    # 2. Recorte estricto de Columna B a J (Índices 1 al 9)
-    df = df.iloc[:, 1:10]
-    
-    # Limpiar encabezados
-    df.columns = [str(c).strip().replace('\n', ' ').upper() for c in df.columns]
-    
-    col_cama = "CAMA"
-    col_nombre = "NOMBRE"
-    col_tipo = "TIPO DE AISLAMIENTO"
-    col_termino = "FECHA DE TÉRMINO"
+from componentes.diagnostico import sesion_actual
+from componentes.tablas import tabla_paginada
+from nucleo.aislamientos import COL_CAMA, COL_NOMBRE, COL_TIPO, FUENTE, SONDEO, aislamientos_activos, indice_busqueda
+from nucleo.diagnostico import etapa
 
-    # --- LIMPIEZA CRÍTICA DE "NONE" Y ESPACIOS ---
-    # Convertimos todo a string, quitamos espacios y reemplazamos variantes de vacío por NaN real
-    df = df.apply(lambda x: x.astype(str).str.strip())
-    df = df.replace(['nan', 'None', 'none', 'NULL', '', ' '], np.nan)
-
-    # 3. LÓGICA DE UNIÓN DE FILAS DOBLES (SIN PERDER DATOS)
-    # Rellenamos Cama y Nombre hacia abajo para identificar que la fila de abajo es del mismo paciente
-    df[col_cama] = df[col_cama].ffill()
-    df[col_nombre] = df[col_nombre].ffill()
-
-    # Agrupamos por paciente y aplicamos reglas específicas por columna
-    # - TIPO DE AISLAMIENTO: Se combinan con "/"
-    # - DEMÁS COLUMNAS: Se toma el primer valor que NO sea nulo (el dato lleno)
-    def consolidar_paciente(group):
-        # Tomamos la primera fila como base
-        res = group.iloc[0].copy()
-        # Combinamos los Tipos de Aislamiento únicos
-        tipos = group[col_tipo].dropna().unique()
-        res[col_tipo] = " / ".join(tipos) if len(tipos) > 0 else np.nan
-        # Para el resto de columnas, buscamos el valor que sí tenga datos en el grupo
-        for col in group.columns:
-            if col not in [col_tipo, col_cama, col_nombre]:
-                val_real = group[col].dropna()
-                res[col] = val_real.iloc[0] if not val_real.empty else np.nan
-        return res
+st.title("🦠 Control de Aislamientos Activos")
 
-    # Aplicamos la consolidación y reseteamos el índice
-    df = df.groupby([col_cama, col_nombre], as_index=False, sort=False).apply(consolidar_paciente)
+def sincronizar():
+    FUENTE.invalidar()
+    if SONDEO.activo:
+        SONDEO.sondear()
 
-    # 4. FILTRO DE FECHA DE TÉRMINO (Sombreado verde)
-    # Si la celda tiene cualquier dato, el paciente se oculta
-    if col_termino in df.columns:
-        df = df[df[col_termino].isna()]
+def novedades():
+    """Deltas del sondeo que esta sesión aún no ha visto (la primera visita no cuenta como novedad)."""
+    vista = st.session_state.setdefault('ais_secuencia_vista', SONDEO.secuencia)
+    cambios = SONDEO.cambios_desde(vista)
+    if not cambios:
+        return
+    nuevos = pd.concat([d["nuevos"] for d in cambios])
+    terminados = pd.concat([d["terminados"] for d in cambios])
+    st.toast(f"🔔 {len(nuevos)} aislamientos nuevos, {len(terminados)} terminados")
+    with st.expander(f"🔔 Cambios desde tu última consulta ({cambios[-1]['hora']:%H:%M})", expanded=True):
+        cols = [c for c in (COL_CAMA, COL_NOMBRE, COL_TIPO) if c in nuevos.columns]
+        c_nuevos, c_term = st.columns(2)
+        c_nuevos.markdown(f"**🆕 Nuevos ({len(nuevos)})**")
+        c_nuevos.dataframe(nuevos[cols], hide_index=True, use_container_width=True)
+        c_term.markdown(f"**✅ Terminados ({len(terminados)})**")
+        c_term.dataframe(terminados[[c for c in cols if c in terminados.columns]], hide_index=True, use_container_width=True)
+    st.session_state['ais_secuencia_vista'] = cambios[-1]["secuencia"]
 
-    # Limpieza de basura y ordenamiento por cama
-    df = df[df[col_cama].notna()]
-    df = df.sort_values(by=col_cama)
+# Con el sondeo activo la tabla se refresca sola, leyendo de memoria (sin esperar a la red)
+@st.fragment(run_every=SONDEO.intervalo if SONDEO.activo else None)
+def aislamientos():
+    sesion_actual()
+    try:
+        with st.container(border=True):
+            if st.button("🔄 Sincronizar Censo en Tiempo Real"):
+                sincronizar()
+                st.rerun()
 
-    return df
+            with etapa("aislamientos.obtener"):
+                df_final = aislamientos_activos()
+            if FUENTE.desactualizado:
+                st.warning("⚠️ Sin conexión con la hoja: se muestra la última copia descargada.")
+            if SONDEO.activo:
+                st.caption(f"Actualización automática cada {SONDEO.intervalo} s · versión {str(FUENTE.version)[:8]}")
+                novedades()
 
-try:
-    with st.container(border=True):
-        if st.button("🔄 Sincronizar Censo en Tiempo Real"):
-            st.cache_data.clear()
-            st.rerun()
+            if not df_final.empty:
+                busqueda = st.text_input("🔍 Buscar por Cama o Nombre:", placeholder="Ej. 7305...")
+                if busqueda:
+                    # Índice precalculado por versión de la hoja; sin acentos ni mayúsculas
+                    with etapa("aislamientos.busqueda"):
+                        df_final = indice_busqueda().buscar(busqueda)
 
-        df_final = cargar_aislamientos_definitivo()
-        
-        if not df_final.empty:
-            busqueda = st.text_input("🔍 Buscar por Cama o Nombre:", placeholder="Ej. 7305...")
-            if busqueda:
-                mask = df_final.apply(lambda row: row.astype(str).str.contains(busqueda, case=False).any(), axis=1)
-                df_final = df_final[mask]
+                # Mostramos la tabla limpia
+                with etapa("aislamientos.tabla"):
+                    tabla_paginada(df_final, "aislamientos", por_pagina=50)
+                st.success(f"📋 {len(df_final)} Aislamientos Activos detectados.")
+            else:
+                st.warning("⚠️ No se detectaron aislamientos activos (Todos tienen Fecha de Término).")
 
-            # Mostramos la tabla limpia
-            st.dataframe(df_final, use_container_width=True, hide_index=True)
-            st.success(f"📋 {len(df_final)} Aislamientos Activos detectados.")
-        else:
-            st.warning("⚠️ No se detectaron aislamientos activos (Todos tienen Fecha de Término).")
+    except Exception as e:
+        st.error(f"Error en la sincronización: {e}")
 
-except Exception as e:
-    st.error(f"Error en la sincronización: {e}")
+aislamientos()
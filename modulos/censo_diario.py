@@ -1,31 +1,18 @@
 import streamlit as st
-import pandas as pd
-import re
-from io import BytesIO
 from datetime import datetime
-from openpyxl import load_workbook
-from openpyxl.worksheet.table import Table, TableStyleInfo
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment, Border, Side, Font
+
+from componentes.diagnostico import sesion_actual
+from nucleo.artefactos import ALMACEN, llave_artefacto
+from nucleo.censo import fechas_invalidas, tabla_epidemiologica
+from nucleo.diagnostico import etapa
+from nucleo.especialidades import INDICE, GRUPO_TERAPIAS
+from nucleo.reportes import excel_censo
 
 # --- CONFIGURACIÓN ---
 st.set_page_config(page_title="EpidemioManager", layout="wide")
 
-# --- REGLAS DE NEGOCIO ESTRICTAS ---
-ORDEN_TERAPIAS_EXCEL = [
-    "UNIDAD CORONARIA", "UCIA", "TERAPIA POSQUIRURGICA", 
-    "U.C.I.N.", "U.T.I.P.", "UNIDAD DE QUEMADOS"
-]
-
-VINCULO_AUTO_INCLUSION = {
-    "COORD_MEDICINA": ["UCIA", "TERAPIA POSQUIRURGICA"],
-    "COORD_CIRUGIA": ["UNIDAD DE QUEMADOS"],
-    "COORD_MODULARES": ["UNIDAD CORONARIA"],
-    "COORD_PEDIATRIA": ["U.C.I.N.", "U.T.I.P."]
-}
-
 COLORES_INTERFAZ = {
-    "⚠️ UNIDADES DE TERAPIA ⚠️": "#C0392B",
+    GRUPO_TERAPIAS: "#C0392B",
     "COORD_PEDIATRIA": "#5DADE2",          
     "COORD_MEDICINA": "#1B4F72",           
     "COORD_GINECOLOGIA": "#F06292",        
@@ -34,107 +21,15 @@ COLORES_INTERFAZ = {
     "COORD_CIRUGIA": "#117864"             
 }
 
-# --- CATALOGO CORREGIDO ---
-CATALOGO = {
-    "COORD_PEDIATRIA": [
-        "MEDICINA INTERNA PEDIATRICA", "PEDIATRI", "PEDIATRICA", 
-        "NEONATO", "NEONATOLOGIA", "CUNERO", "UTIP", "UCIN"
-    ],
-    "COORD_MODULARES": [
-        "NEUROLOGIA", "ANGIOLOGIA", "VASCULAR", "CARDIOLOGIA", 
-        "CARDIOVASCULAR", "TORAX", "NEUMO", "HEMATO", "NEUROCIRUGIA", 
-        "ONCOLOGIA", "CORONARIA", "PSIQ", "PSIQUIATRIA"
-    ],
-    "COORD_MEDICINA": [
-        "DERMATO", "ENDOCRINO", "GERIAT", "INMUNO", "MEDICINA INTERNA", 
-        "REUMA", "UCIA", "TERAPIA INTERMEDIA", "CLINICA DEL DOLOR", "TPQX"
-    ],
-    "COORD_CIRUGIA": [
-        "CIRUGIA GENERAL", "CIR. GENERAL", "MAXILO", "RECONSTRUCTIVA", 
-        "PLASTICA", "GASTRO", "NEFROLOGIA", "OFTALMO", "ORTOPEDIA", 
-        "OTORRINO", "UROLOGIA", "TRASPLANTES", "QUEMADOS"
-    ],
-    "COORD_GINECOLOGIA": [
-        "GINECO", "OBSTETRICIA", "MATERNO", "REPRODUCCION"
-    ]
-}
-
-def obtener_especialidad_real(cama, esp_html):
-    c = str(cama).strip().upper()
-    esp_html_clean = esp_html.replace("ESPECIALIDAD:", "").replace("&NBSP;", "").strip().upper()
-    if c.startswith("64"): return "UNIDAD CORONARIA"
-    if c.startswith("55"): return "U.C.I.N."
-    if c.startswith("45"): return "NEONATOLOGIA" 
-    if c.startswith("56"): return "U.T.I.P."
-    if c.startswith("85"): return "UNIDAD DE QUEMADOS"
-    if c.startswith("73"): return "UCIA"
-    if c.isdigit() and 7401 <= int(c) <= 7409: return "TERAPIA POSQUIRURGICA"
-    return esp_html_clean
-
 def sync_group(cat_name, servicios):
     master_val = st.session_state[f"master_{cat_name}"]
     for s in servicios: st.session_state[f"serv_{cat_name}_{s}"] = master_val
 
-st.title("📋 Censo Epidemiológico Diario")
-
-if 'archivo_compartido' not in st.session_state:
-    st.info("👈 Por favor, sube el archivo HTML en la barra lateral.")
-else:
-    try:
-        tablas = pd.read_html(st.session_state['archivo_compartido'])
-        df_completo = max(tablas, key=len)
-        col0_str = df_completo.iloc[:, 0].fillna("").astype(str).str.upper()
-        
-        pacs_detectados = []
-        especialidades_encontradas = set()
-        IGNORAR = ["PACIENTES", "TOTAL", "SUBTOTAL", "PÁGINA", "IMPRESIÓN", "1111"]
-        
-        esp_actual_temp = "SIN_ESPECIALIDAD"
-        for i, val in enumerate(col0_str):
-            if "ESPECIALIDAD:" in val: esp_actual_temp = val; continue
-            fila = [str(x).strip() for x in df_completo.iloc[i].values]
-            if any(x in fila[0] for x in IGNORAR): continue
-            if len(fila[1]) >= 5 and any(char.isdigit() for char in fila[1]):
-                esp_real = obtener_especialidad_real(fila[0], esp_actual_temp)
-                especialidades_encontradas.add(esp_real)
-                pacs_detectados.append({
-                    "CAMA": fila[0], "REG": fila[1], "PAC": fila[2], "SEXO": fila[3], 
-                    "EDAD": "".join(re.findall(r'\d+', fila[4])), "DIAG": fila[6], 
-                    "ING": fila[9], "esp_real": esp_real
-                })
-
-        # --- ETIQUETA DE PACIENTES RECUPERADA ---
-        st.subheader(f"📊 Pacientes Detectados: {len(pacs_detectados)}")
-
-        buckets = {}
-        asignadas = set()
-
-        # 1. Terapias
-        terapias_list = sorted([e for e in especialidades_encontradas if e in ORDEN_TERAPIAS_EXCEL])
-        if terapias_list:
-            buckets["⚠️ UNIDADES DE TERAPIA ⚠️"] = terapias_list
-            asignadas.update(terapias_list)
-
-        # 2. Pediatría (Prioridad para M.I. Pediátrica)
-        kws_ped = CATALOGO["COORD_PEDIATRIA"]
-        ped_found = sorted([e for e in especialidades_encontradas if e not in asignadas and any(kw in e for kw in kws_ped)])
-        if ped_found:
-            buckets["COORD_PEDIATRIA"] = ped_found
-            asignadas.update(ped_found)
-
-        # 3. Resto de Coordinaciones (Neurología en Modulares)
-        orden_resto = ["COORD_MODULARES", "COORD_MEDICINA", "COORD_CIRUGIA", "COORD_GINECOLOGIA"]
-        for cat in orden_resto:
-            if cat in buckets: continue
-            kws = CATALOGO[cat]
-            found = sorted([e for e in especialidades_encontradas if e not in asignadas and any(kw in e for kw in kws)])
-            if found:
-                buckets[cat] = found
-                asignadas.update(found)
-
-        otras = sorted([e for e in especialidades_encontradas if e not in asignadas])
-        if otras: buckets["OTRAS_ESPECIALIDADES"] = otras
-
+@st.fragment
+def cuadricula_servicios(buckets):
+    """Casillas por coordinación; marcar o desmarcar solo vuelve a correr este fragmento."""
+    sesion_actual()
+    with etapa("censo.cuadricula"):
         cols = st.columns(3)
         for idx, (cat_name, servicios) in enumerate(buckets.items()):
             with cols[idx % 3]:
@@ -144,65 +39,61 @@ else:
                     st.checkbox(f"Seleccionar todo", key=f"master_{cat_name}", on_change=sync_group, args=(cat_name, servicios))
                     for s in servicios: st.checkbox(s, key=f"serv_{cat_name}_{s}")
 
-        st.write("---")
-
+@st.fragment
+def reporte_excel(df_pacs, buckets, especialidades_encontradas):
+    """Botón del Excel: lee la selección guardada en la sesión sin recorrer la página completa."""
+    sesion_actual()
+    try:
         if st.button("🚀 GENERAR EXCEL", use_container_width=True, type="primary"):
-            especialidades_finales = set()
-            for c_name, servs in buckets.items():
-                if st.session_state.get(f"master_{c_name}"):
-                    if c_name in VINCULO_AUTO_INCLUSION:
-                        for t in VINCULO_AUTO_INCLUSION[c_name]:
-                            if t in especialidades_encontradas: especialidades_finales.add(t)
-                for s in servs:
-                    if st.session_state.get(f"serv_{c_name}_{s}"): especialidades_finales.add(s)
+            especialidades_finales = INDICE.seleccion_final(
+                buckets,
+                {c for c in buckets if st.session_state.get(f"master_{c}")},
+                {s for c, servs in buckets.items() for s in servs if st.session_state.get(f"serv_{c}_{s}")},
+                especialidades_encontradas,
+            )
 
             if not especialidades_finales:
                 st.warning("Selecciona al menos un servicio.")
             else:
                 fecha_hoy = datetime.now()
-                datos_excel = []
-                for p in pacs_detectados:
-                    if p["esp_real"] in especialidades_finales:
-                        try:
-                            f_ing = datetime.strptime(p["ING"], "%d/%m/%Y")
-                            dias = (datetime(fecha_hoy.year, fecha_hoy.month, fecha_hoy.day) - datetime(f_ing.year, f_ing.month, f_ing.day)).days + 1
-                        except: dias = "Rev."
-                        datos_excel.append({"FECHA_REPORTE": fecha_hoy.strftime("%d/%m/%Y"), "ESPECIALIDAD": p["esp_real"], "CAMA": p["CAMA"], "REGISTRO": p["REG"], "PACIENTE": p["PAC"], "SEXO": p["SEXO"], "EDAD": p["EDAD"], "DIAGNOSTICO": p["DIAG"], "FECHA_INGRESO": p["ING"], "DIAS_ESTANCIA": dias})
-
-                if datos_excel:
-                    df_out = pd.DataFrame(datos_excel)
-                    otros_servs = sorted([s for s in list(especialidades_finales) if s not in ORDEN_TERAPIAS_EXCEL])
-                    mapeo_orden = ORDEN_TERAPIAS_EXCEL + otros_servs
-                    df_out['ESPECIALIDAD'] = pd.Categorical(df_out['ESPECIALIDAD'], categories=mapeo_orden, ordered=True)
-                    df_out = df_out.sort_values(['ESPECIALIDAD', 'CAMA'])
-
-                    output = BytesIO()
-                    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                        df_out.to_excel(writer, index=False, sheet_name='Epidemiologia')
-                    
-                    output.seek(0)
-                    wb = load_workbook(output); ws = wb.active
-                    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-
-                    for col in ws.columns:
-                        max_length = 0
-                        column_letter = get_column_letter(col[0].column)
-                        for cell in col:
-                            cell.border = thin_border
-                            cell.alignment = Alignment(wrap_text=True, vertical="center", horizontal="center")
-                            try:
-                                if cell.value:
-                                    val_len = len(str(cell.value))
-                                    if val_len > max_length: max_length = val_len
-                            except: pass
-                        ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
-                    
-                    tab = Table(displayName="CensoTable", ref=ws.dimensions)
-                    tab.tableStyleInfo = TableStyleInfo(name="TableStyleMedium9", showRowStripes=True)
-                    ws.add_table(tab)
-                    
-                    final_io = BytesIO(); wb.save(final_io)
+                df_out = tabla_epidemiologica(df_pacs, especialidades_finales, INDICE.orden_terapias, fecha_hoy)
+
+                if not df_out.empty:
+                    # Mismo censo + selección + fecha -> mismo archivo, sin regenerarlo
+                    llave = llave_artefacto("censo_excel", st.session_state.get('censo_huella'), especialidades_finales, fecha_hoy.strftime("%d/%m/%Y"))
+                    excel_bytes = ALMACEN.obtener(llave, lambda: excel_censo(df_out))
                     st.success("✅ Reporte de censo generado.") 
-                    st.download_button(label="💾 DESCARGAR EXCEL", data=final_io.getvalue(), file_name=f"Censo_Epidemio_{fecha_hoy.strftime('%d%m%Y')}.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
+                    st.download_button(label="💾 DESCARGAR EXCEL", data=excel_bytes, file_name=f"Censo_Epidemio_{fecha_hoy.strftime('%d%m%Y')}.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
+    except Exception as e:
+        st.error(f"Error detectado: {e}")
+
+st.title("📋 Censo Epidemiológico Diario")
+
+if 'df_censo' not in st.session_state:
+    st.info("👈 Por favor, sube el archivo HTML en la barra lateral.")
+else:
+    try:
+        df_censo = st.session_state['df_censo']
+        
+        with etapa("censo.especialidades"):
+            df_pacs = df_censo.assign(ESP_REAL=INDICE.resolver_columna(df_censo["CAMA"], df_censo["ESP_HTML"]))
+            especialidades_encontradas = set(df_pacs["ESP_REAL"])
+
+        # --- ETIQUETA DE PACIENTES RECUPERADA ---
+        st.subheader(f"📊 Pacientes Detectados: {len(df_pacs)}")
+
+        df_revisar = fechas_invalidas(df_pacs)
+        if not df_revisar.empty:
+            with st.expander(f"⚠️ {len(df_revisar)} pacientes con fecha de ingreso ilegible (sin días de estancia)"):
+                st.dataframe(df_revisar[["CAMA", "REGISTRO", "PACIENTE", "FECHA DE INGRESO", "ESP_REAL"]], hide_index=True, use_container_width=True)
+
+        # Terapias -> Pediatría (prioridad para M.I. Pediátrica) -> resto de coordinaciones -> otras
+        buckets = INDICE.agrupar(especialidades_encontradas)
+
+        cuadricula_servicios(buckets)
+
+        st.write("---")
+
+        reporte_excel(df_pacs, buckets, especialidades_encontradas)
     except Exception as e:
         st.error(f"Error detectado: {e}")
@@ -0,0 +1,87 @@
+import streamlit as st
+import pandas as pd
+from datetime import date, timedelta
+
+from nucleo.aislamientos import aislamientos_activos
+from nucleo.especialidades import INDICE
+from nucleo.historico import historico
+from nucleo.insumos import limpiar_aislamientos
+
+st.title("📈 Histórico y Tendencias")
+
+almacen = historico()
+
+# --- GUARDAR EL CENSO CARGADO ---
+with st.container(border=True):
+    if 'df_censo' not in st.session_state:
+        st.info("👈 Sube un censo en la barra lateral para agregarlo al histórico.")
+    else:
+        fecha_censo = st.date_input("Fecha del censo cargado", value=date.today(), format="DD/MM/YYYY")
+        if st.button("💾 Guardar censo en histórico", use_container_width=True):
+            df_censo = st.session_state['df_censo']
+            df_pacs = df_censo.assign(ESP_REAL=INDICE.resolver_columna(df_censo["CAMA"], df_censo["ESP_HTML"]))
+            df_ais = None
+            if fecha_censo == date.today():
+                try:
+                    # Misma limpieza que el lote (sin REGISTROs de ruido ni filas sin REGISTRO)
+                    df_ais = limpiar_aislamientos(aislamientos_activos())
+                except Exception as e:
+                    st.warning(f"Se guardó sin aislamientos: {e}")
+            else:
+                # La hoja solo tiene los aislamientos de hoy; no se atribuyen a una fecha pasada
+                st.info("Censo de otra fecha: se guarda sin aislamientos.")
+            if almacen.guardar(fecha_censo, df_pacs, df_ais, st.session_state.get('censo_huella')):
+                st.success(f"✅ Censo del {fecha_censo.strftime('%d/%m/%Y')} guardado ({len(df_pacs)} pacientes).")
+            else:
+                st.info("Ese censo ya estaba guardado para esa fecha.")
+
+try:
+    fechas = almacen.fechas()
+    if fechas.empty:
+        st.info("Aún no hay censos guardados en el histórico.")
+    else:
+        ultima = pd.to_datetime(fechas["fecha"]).max().date()
+        rango = st.date_input("Periodo", value=(max(ultima - timedelta(days=90), pd.to_datetime(fechas["fecha"]).min().date()), ultima), format="DD/MM/YYYY")
+        desde, hasta = (rango[0], rango[-1]) if isinstance(rango, (tuple, list)) else (rango, rango)
+        st.caption(f"{len(fechas)} censos guardados · último: {ultima.strftime('%d/%m/%Y')}")
+
+        # --- OCUPACIÓN Y AISLAMIENTOS ---
+        col_oc, col_ais = st.columns(2)
+        with col_oc:
+            st.subheader("🛏️ Pacientes por día")
+            df_oc = almacen.ocupacion(desde, hasta)
+            if not df_oc.empty:
+                st.line_chart(df_oc.groupby("fecha")["pacientes"].sum().rename("PACIENTES"))
+        with col_ais:
+            st.subheader("🦠 Prevalencia de aislamientos (%)")
+            df_prev = almacen.prevalencia_aislamientos(desde, hasta)
+            if not df_prev.empty:
+                st.line_chart(df_prev.set_index("fecha")["prevalencia"])
+
+        # --- ESTANCIA ---
+        st.subheader("⏱️ Días de estancia por especialidad")
+        especialidades = sorted(df_oc["especialidad"].dropna().unique()) if not df_oc.empty else []
+        esp_sel = st.selectbox("Especialidad", ["TODAS"] + especialidades)
+        df_est = almacen.estancias(desde, hasta, None if esp_sel == "TODAS" else esp_sel)
+        if not df_est.empty:
+            st.bar_chart(df_est["dias_estancia"].clip(upper=60).value_counts().sort_index().rename("PACIENTES"))
+            resumen = df_est.groupby("especialidad")["dias_estancia"].describe()[["count", "mean", "50%", "max"]]
+            resumen.columns = ["PACIENTES", "PROMEDIO", "MEDIANA", "MÁXIMO"]
+            st.dataframe(resumen.round(1), use_container_width=True)
+
+        # --- MOVIMIENTOS DEL DÍA ---
+        st.subheader("🔁 Movimientos contra el censo anterior")
+        fecha_mov = st.selectbox("Fecha", fechas["fecha"].iloc[::-1].tolist(), format_func=lambda f: pd.to_datetime(f).strftime("%d/%m/%Y"))
+        mov = almacen.movimientos(fecha_mov)
+        if mov["fecha_anterior"] is None:
+            st.info("No hay un censo anterior guardado para comparar.")
+        else:
+            tab_in, tab_eg, tab_tr = st.tabs([
+                f"Ingresos ({len(mov['ingresos'])})", f"Egresos ({len(mov['egresos'])})", f"Traslados ({len(mov['traslados'])})",
+            ])
+            with tab_in: st.dataframe(mov["ingresos"], use_container_width=True, hide_index=True)
+            with tab_eg: st.dataframe(mov["egresos"], use_container_width=True, hide_index=True)
+            with tab_tr: st.dataframe(mov["traslados"], use_container_width=True, hide_index=True)
+
+except Exception as e:
+    st.error(f"Error en el histórico: {e}")
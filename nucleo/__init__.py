@@ -0,0 +1 @@
+"""Lógica compartida (sin interfaz) de EpidemioManager."""
@@ -0,0 +1,361 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+from nucleo.busqueda import IndiceBusqueda
+from nucleo.diagnostico import cronometrar, en_hilo
+
+# --- CONFIGURACIÓN ---
+SHEET_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ8qN_ymtBcRCY2DcyEAANAzPPasVeYL6h0l4-AhuL2JYXpBOQ0e-mtrtoeSRvcnnl66HEh9aCJQwpx/pub?gid=0&single=true&output=csv"
+
+# La URL y la carpeta del snapshot se pueden cambiar (p. ej. un servidor HTTP local para pruebas)
+URL_AISLAMIENTOS = os.environ.get("EPIDEMIO_URL_AISLAMIENTOS", SHEET_URL)
+DIR_SNAPSHOT = Path(os.environ.get("EPIDEMIO_DIR_CACHE", Path(tempfile.gettempdir()) / "epidemio"))
+TTL_SEGUNDOS = int(os.environ.get("EPIDEMIO_TTL_AISLAMIENTOS", "120"))
+TIMEOUT_SEGUNDOS = 15
+# Espera máxima de una página por la carga en segundo plano (descarga + consolidación)
+TIMEOUT_CARGA_SEGUNDOS = TIMEOUT_SEGUNDOS + 15
+# Cada cuántos segundos el hilo de sondeo consulta la hoja (0 lo desactiva); menor que el TTL
+INTERVALO_SONDEO = int(os.environ.get("EPIDEMIO_INTERVALO_SONDEO", "60"))
+MAX_CAMBIOS = 50
+
+COL_CAMA = "CAMA"
+COL_REGISTRO = "REGISTRO"
+COL_NOMBRE = "NOMBRE"
+COL_TIPO = "TIPO DE AISLAMIENTO"
+COL_TERMINO = "FECHA DE TÉRMINO"
+LLAVES = [COL_CAMA, COL_NOMBRE]
+
+VALORES_VACIOS = ["nan", "NAN", "None", "none", "NULL", ""]
+
+# --- FUENTE DE DATOS ---
+
+class FuenteAislamientos:
+    """CSV publicado de aislamientos con caché en memoria (TTL), peticiones condicionales y snapshot en disco.
+
+    - Dentro del TTL se devuelve el último contenido sin tocar la red.
+    - Al vencer se envía If-None-Match / If-Modified-Since; un 304 solo renueva el TTL.
+    - Si la red falla se sirve el último contenido bueno (memoria o disco) marcado como desactualizado.
+    """
+
+    def __init__(self, url=URL_AISLAMIENTOS, ttl=TTL_SEGUNDOS, dir_snapshot=DIR_SNAPSHOT, timeout=TIMEOUT_SEGUNDOS):
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        nombre = hashlib.sha1(url.encode()).hexdigest()[:12]
+        self.ruta_csv = Path(dir_snapshot) / f"aislamientos_{nombre}.csv"
+        self.ruta_meta = self.ruta_csv.with_suffix(".json")
+        self.contenido = None
+        self.meta = {}
+        self.verificado = 0.0
+        self.desactualizado = False
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        """Hash del contenido vigente; cambia solo cuando el CSV cambia."""
+        return self.meta.get("version")
+
+    def invalidar(self):
+        self.verificado = 0.0
+
+    def obtener(self, forzar=False):
+        """Devuelve los bytes del CSV vigente."""
+        return self.obtener_con_version(forzar)[0]
+
+    def obtener_con_version(self, forzar=False):
+        """Devuelve (bytes, versión) del CSV vigente; seguro entre hilos.
+
+        Las sesiones concurrentes esperan a la descarga en curso y comparten su resultado:
+        quien encuentre que otro hilo ya verificó mientras esperaba no vuelve a descargar.
+        """
+        visto = self.verificado
+        with self._lock:
+            fresco = self.contenido is not None and time.monotonic() - self.verificado < self.ttl
+            if fresco and (not forzar or self.verificado != visto):
+                return self.contenido, self.version
+            try:
+                self._descargar()
+            except (urllib.error.URLError, OSError) as e:
+                if self.contenido is None and not self._leer_snapshot():
+                    raise ConnectionError(f"No se pudo descargar la hoja de aislamientos y no hay copia local: {e}") from e
+                self.desactualizado = True
+                # Se reintenta al vencer de nuevo el TTL, no en cada rerun
+                self.verificado = time.monotonic()
+            return self.contenido, self.version
+
+    @cronometrar("aislamientos.descarga")
+    def _descargar(self):
+        peticion = urllib.request.Request(self.url)
+        if self.contenido is not None:
+            if self.meta.get("etag"): peticion.add_header("If-None-Match", self.meta["etag"])
+            if self.meta.get("last_modified"): peticion.add_header("If-Modified-Since", self.meta["last_modified"])
+        try:
+            with urllib.request.urlopen(peticion, timeout=self.timeout) as resp:
+                contenido = resp.read()
+                etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        except urllib.error.HTTPError as e:
+            if e.code != 304: raise
+        else:
+            self.contenido = contenido
+            self.meta = {
+                "url": self.url, "etag": etag, "last_modified": last_modified,
+                "version": hashlib.sha1(contenido).hexdigest(), "descargado": time.time(),
+            }
+            self._guardar_snapshot()
+        self.verificado = time.monotonic()
+        self.desactualizado = False
+
+    def _guardar_snapshot(self):
+        try:
+            self.ruta_csv.parent.mkdir(parents=True, exist_ok=True)
+            for ruta, datos in ((self.ruta_csv, self.contenido), (self.ruta_meta, json.dumps(self.meta).encode())):
+                tmp = ruta.with_suffix(ruta.suffix + ".tmp")
+                tmp.write_bytes(datos)
+                os.replace(tmp, ruta)
+        except OSError:
+            pass  # El snapshot es solo un respaldo; no debe romper la carga
+
+    def _leer_snapshot(self):
+        try:
+            self.contenido = self.ruta_csv.read_bytes()
+            self.meta = json.loads(self.ruta_meta.read_text())
+        except (OSError, ValueError):
+            self.contenido, self.meta = None, {}
+            return False
+        return True
+
+class AislamientosPublicados:
+    """DataFrames consolidados compartidos por todas las sesiones hasta que cambie la versión del CSV.
+
+    La consolidación de cada versión corre una sola vez por proceso; las sesiones que llegan
+    mientras se consolida esperan y reciben el mismo objeto (tratarlo como solo lectura).
+    """
+
+    def __init__(self, fuente):
+        self.fuente = fuente
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._publicados = {}
+
+    def obtener(self, nombre, consolidar, forzar=False):
+        contenido, version = self.fuente.obtener_con_version(forzar)
+        with self._lock:
+            lock = self._locks.setdefault(nombre, threading.Lock())
+        with lock:
+            publicado = self._publicados.get(nombre)
+            if publicado is None or publicado[0] != version:
+                publicado = (version, consolidar(contenido))
+                self._publicados[nombre] = publicado
+            return publicado[1]
+
+# --- CONSOLIDACIÓN ---
+
+def _leer_csv(contenido):
+    # Columnas B a J (posiciones 1-9), todo como texto con el motor C
+    try:
+        return pd.read_csv(BytesIO(contenido), skiprows=1, usecols=range(1, 10), dtype=str, encoding="utf-8")
+    except ValueError:
+        # Hoja con menos columnas de las esperadas
+        return pd.read_csv(BytesIO(contenido), skiprows=1, dtype=str, encoding="utf-8").iloc[:, 1:10]
+
+def _preparar(contenido):
+    """CSV crudo -> filas limpias, con CAMA/NOMBRE propagados a las filas de continuación del paciente."""
+    df = _leer_csv(contenido)
+    df.columns = [str(c).strip().replace('\n', ' ').upper() for c in df.columns]
+    for col in df.columns:
+        df[col] = df[col].str.strip()
+    df = df.mask(df.isin(VALORES_VACIOS))
+
+    # La fila de abajo pertenece al mismo paciente si no trae Cama/Nombre
+    df[COL_CAMA] = df[COL_CAMA].ffill()
+    df[COL_NOMBRE] = df[COL_NOMBRE].ffill()
+    return df
+
+def _agrupar(df):
+    """Una fila por (CAMA, NOMBRE): primer valor no vacío y tipos únicos unidos con " / " (índice = llaves)."""
+    res = df.groupby(LLAVES, sort=False).first()
+    if COL_TIPO in df.columns:
+        tipos = df[LLAVES + [COL_TIPO]].dropna().drop_duplicates()
+        res[COL_TIPO] = tipos.groupby(LLAVES, sort=False)[COL_TIPO].agg(" / ".join).reindex(res.index)
+    return res
+
+def _activos(res):
+    """Sin FECHA DE TÉRMINO y con cama, ordenados por cama (y nombre, para un orden estable)."""
+    res = res.reset_index()
+    if COL_TERMINO in res.columns:
+        res = res[res[COL_TERMINO].isna()]
+    res = res[res[COL_CAMA].notna()]
+    return res.sort_values(by=LLAVES, kind="stable")
+
+@cronometrar("aislamientos.consolidacion")
+def consolidar_aislamientos(contenido):
+    """Une las filas dobles de cada paciente y deja solo los aislamientos activos, ordenados por cama.
+
+    - TIPO DE AISLAMIENTO: valores únicos unidos con " / ".
+    - Demás columnas: primer valor no vacío del paciente.
+    - Se ocultan los pacientes con cualquier dato en FECHA DE TÉRMINO.
+    """
+    return _activos(_agrupar(_preparar(contenido)))
+
+# --- CONSOLIDACIÓN INCREMENTAL ---
+
+def huellas_pacientes(df):
+    """Hash por (CAMA, NOMBRE) de todas sus filas crudas, sensible al orden; cambia si cambia cualquier celda."""
+    filas = df.assign(_orden=df.groupby(LLAVES, sort=False).cumcount())
+    h = pd.Series(pd.util.hash_pandas_object(filas, index=False).to_numpy(), index=df.index)
+    # La suma en uint64 da la vuelta (módulo 2**64): sirve como combinación de las filas del grupo
+    return h.groupby([df[c] for c in LLAVES], sort=False).sum()
+
+class ConsolidadoIncremental:
+    """Tabla consolidada que se actualiza solo en los pacientes cuyas filas cambiaron entre versiones."""
+
+    def __init__(self):
+        self.todos = None       # una fila por paciente (activos y terminados), índice = LLAVES
+        self.huellas = None
+        self.activos = None
+
+    @cronometrar("aislamientos.incremental")
+    def aplicar(self, contenido):
+        """Aplica una versión nueva del CSV; devuelve el delta (nuevos, terminados, cambiados, quitados)."""
+        df = _preparar(contenido)
+        df = df[df[COL_NOMBRE].notna() | df[COL_CAMA].notna()]
+        huellas = huellas_pacientes(df)
+        previas = self.huellas if self.huellas is not None else huellas.iloc[:0]
+
+        comunes = huellas.index.intersection(previas.index)
+        iguales = comunes[huellas.loc[comunes].to_numpy() == previas.loc[comunes].to_numpy()]
+        cambiados = huellas.index.difference(iguales)
+        quitados = previas.index.difference(huellas.index)
+
+        filas = pd.MultiIndex.from_frame(df[LLAVES]).isin(cambiados)
+        nuevos_grupos = _agrupar(df[filas])
+        base = self.todos.drop(index=cambiados.union(quitados), errors="ignore") if self.todos is not None else None
+        todos = pd.concat([base, nuevos_grupos]) if base is not None and len(base) else nuevos_grupos
+
+        antes = self._llaves_activas if self.activos is not None else pd.MultiIndex.from_arrays([[], []], names=LLAVES)
+        activos = _activos(todos)
+        ahora = pd.MultiIndex.from_frame(activos[LLAVES])
+        # Terminados: activos en la versión anterior que ya no lo están; con FECHA DE TÉRMINO nueva (siguen
+        # en `todos`) o borrados de la hoja (solo quedan en la tabla anterior)
+        borrados = self.todos[self.todos.index.isin(quitados) & self.todos.index.isin(antes)] if self.todos is not None else None
+        terminados = pd.concat([todos[todos.index.isin(antes) & ~todos.index.isin(ahora)], borrados]).reset_index()
+
+        self.todos, self.huellas, self.activos, self._llaves_activas = todos, huellas, activos, ahora
+        return {
+            "nuevos": activos[~ahora.isin(antes)],
+            "terminados": terminados,
+            "cambiados": len(cambiados), "quitados": len(quitados),
+        }
+
+# --- SONDEO EN SEGUNDO PLANO ---
+
+class SondeoAislamientos:
+    """Hilo que consulta la hoja cada `intervalo` segundos y mantiene la tabla consolidada al día.
+
+    Solo cuando cambia la versión del CSV se aplica el delta (ConsolidadoIncremental); cada delta
+    queda numerado en `cambios` para que las páginas muestren lo nuevo desde su última visita.
+    Las sesiones leen `publicado` sin tocar la red.
+    """
+
+    def __init__(self, fuente, intervalo=INTERVALO_SONDEO, max_cambios=MAX_CAMBIOS):
+        self.fuente = fuente
+        self.intervalo = intervalo
+        self.consolidado = ConsolidadoIncremental()
+        self.publicado = (None, None)      # (versión, activos), se reemplaza de una sola vez
+        self.cambios = deque(maxlen=max_cambios)
+        self.secuencia = 0
+        self.error = None
+        self._lock = threading.Lock()
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    @property
+    def activo(self):
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def iniciar(self):
+        """Arranca el hilo una sola vez por proceso (idempotente)."""
+        with self._lock:
+            if self.activo or self.intervalo <= 0: return
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._ciclo, name="sondeo-aislamientos", daemon=True)
+            self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        self._despertar.set()
+
+    def sondear(self):
+        """Una consulta (petición condicional); si la versión cambió aplica el delta y lo devuelve."""
+        contenido, version = self.fuente.obtener_con_version(forzar=True)
+        with self._lock:
+            if version == self.publicado[0]:
+                return None
+            inicial = self.publicado[1] is None
+            delta = self.consolidado.aplicar(contenido)
+            self.publicado = (version, self.consolidado.activos)
+            if inicial:
+                return None  # la primera carga no es un "cambio"
+            self.secuencia += 1
+            delta.update(secuencia=self.secuencia, version=version, hora=datetime.now())
+            self.cambios.append(delta)
+            return delta
+
+    def cambios_desde(self, secuencia):
+        """Deltas posteriores a `secuencia` (los más viejos primero)."""
+        return [d for d in list(self.cambios) if d["secuencia"] > secuencia]
+
+    def _ciclo(self):
+        while not self._detener.is_set():
+            try:
+                self.sondear()
+                self.error = None
+            except Exception as e:
+                self.error = e
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+
+FUENTE = FuenteAislamientos()
+PUBLICADOS = AislamientosPublicados(FUENTE)
+SONDEO = SondeoAislamientos(FUENTE)
+
+def iniciar_sondeo():
+    SONDEO.iniciar()
+
+def aislamientos_activos(forzar=False):
+    """Aislamientos activos consolidados de la versión vigente de la hoja (compartidos, solo lectura).
+
+    Con el sondeo activo se devuelve su tabla sin esperar a la red.
+    """
+    version, activos = SONDEO.publicado
+    if not forzar and activos is not None and SONDEO.activo and version == FUENTE.version:
+        return activos
+    return PUBLICADOS.obtener("aislamientos", consolidar_aislamientos, forzar)
+
+# Hilos para descargar y consolidar mientras la página prepara el censo (la red libera el GIL)
+_POOL_CARGA = ThreadPoolExecutor(max_workers=2, thread_name_prefix="aislamientos")
+
+def precargar_aislamientos():
+    """Lanza `aislamientos_activos()` en segundo plano y devuelve el Future.
+
+    Varias precargas simultáneas comparten la misma descarga (candados de FUENTE/PUBLICADOS).
+    """
+    return _POOL_CARGA.submit(en_hilo(aislamientos_activos))
+
+def indice_busqueda():
+    """Índice de búsqueda de los aislamientos activos; se reconstruye solo cuando cambia la hoja."""
+    return PUBLICADOS.obtener("busqueda", lambda contenido: IndiceBusqueda(aislamientos_activos()))
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+# --- CONFIGURACIÓN ---
+MAX_ARTEFACTOS = 64
+MAX_BYTES = 256 * 1024 * 1024
+UMBRAL_DISCO = 4 * 1024 * 1024
+DIR_ARTEFACTOS = Path(os.environ.get("EPIDEMIO_DIR_CACHE", Path(tempfile.gettempdir()) / "epidemio")) / "artefactos"
+
+def llave_artefacto(*partes):
+    """Llave estable a partir de las partes que determinan el reporte (tipo, censo, selección, fecha...)."""
+    h = hashlib.sha256()
+    for p in partes:
+        if isinstance(p, (set, frozenset)): p = sorted(p)
+        h.update(repr(p).encode()); h.update(b"\x1f")
+    return h.hexdigest()
+
+def huella_df(df, *partes):
+    """Hash del contenido de una tabla (p. ej. tras ediciones manuales) y de `partes` extra (servicio, fechas...)."""
+    h = hashlib.sha256(llave_artefacto(*partes, list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+class AlmacenArtefactos:
+    """Excel/PDF ya generados, compartidos por todas las sesiones (LRU acotado por cantidad y tamaño).
+
+    Los artefactos grandes se guardan en un archivo temporal en lugar de en memoria (uno por entrada;
+    los que quedan de una ejecución anterior se borran en la primera escritura a disco).
+    Dos clics seguidos sobre la misma llave generan el archivo una sola vez.
+    """
+
+    def __init__(self, max_artefactos=MAX_ARTEFACTOS, max_bytes=MAX_BYTES, umbral_disco=UMBRAL_DISCO, directorio=DIR_ARTEFACTOS):
+        self.max_artefactos = max_artefactos
+        self.max_bytes = max_bytes
+        self.umbral_disco = umbral_disco
+        self.directorio = Path(directorio)
+        self._datos = OrderedDict()  # llave -> (bytes | Path, tamaño)
+        self._total = 0
+        self._lock = threading.Lock()
+        self._generando = {}
+        self._directorio_limpio = False
+
+    def get(self, llave):
+        with self._lock:
+            item = self._datos.get(llave)
+            if item is None: return None
+            self._datos.move_to_end(llave)
+            contenido = item[0]
+        if isinstance(contenido, Path):
+            try:
+                return contenido.read_bytes()
+            except OSError:
+                self._quitar(llave)
+                return None
+        return contenido
+
+    def put(self, llave, datos):
+        contenido = datos
+        if len(datos) >= self.umbral_disco:
+            try:
+                self._preparar_directorio()
+                # Nombre único: reemplazar una llave no debe borrar el archivo recién escrito
+                ruta = self.directorio / f"{llave}-{uuid.uuid4().hex[:8]}"
+                ruta.write_bytes(datos)
+                contenido = ruta
+            except OSError:
+                pass  # Sin disco disponible se queda en memoria
+        with self._lock:
+            self._quitar_sin_lock(llave)
+            self._datos[llave] = (contenido, len(datos))
+            self._total += len(datos)
+            while self._datos and (len(self._datos) > self.max_artefactos or self._total > self.max_bytes):
+                self._quitar_sin_lock(next(iter(self._datos)))
+
+    def obtener(self, llave, generar):
+        """Bytes del artefacto; si no existe se genera una sola vez aunque lo pidan varias sesiones."""
+        datos = self.get(llave)
+        if datos is not None: return datos
+        with self._lock:
+            lock = self._generando.setdefault(llave, threading.Lock())
+        with lock:
+            datos = self.get(llave)
+            if datos is None:
+                datos = generar()
+                self.put(llave, datos)
+        with self._lock:
+            self._generando.pop(llave, None)
+        return datos
+
+    def _preparar_directorio(self):
+        with self._lock:
+            if self._directorio_limpio: return
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            # Archivos de un proceso anterior: ninguna entrada en memoria los referencia
+            for ruta in self.directorio.iterdir():
+                try:
+                    ruta.unlink()
+                except OSError:
+                    pass
+            self._directorio_limpio = True
+
+    def _quitar(self, llave):
+        with self._lock:
+            self._quitar_sin_lock(llave)
+
+    def _quitar_sin_lock(self, llave):
+        item = self._datos.pop(llave, None)
+        if item is None: return
+        contenido, tam = item
+        self._total -= tam
+        if isinstance(contenido, Path):
+            try:
+                contenido.unlink()
+            except OSError:
+                pass
+
+ALMACEN = AlmacenArtefactos()
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+# --- CONFIGURACIÓN ---
+COLUMNAS_INDEXADAS = ["CAMA", "REGISTRO", "NOMBRE"]
+SEPARADOR = "\x1f"
+N = 3
+
+def normalizar(serie):
+    """Mayúsculas y sin acentos ("Pérez" -> "PEREZ") para comparar sin importar la captura."""
+    return (serie.fillna("").astype(str).str.upper().str.normalize("NFKD")
+            .str.encode("ascii", "ignore").str.decode("ascii"))
+
+def normalizar_texto(texto):
+    return normalizar(pd.Series([texto])).iat[0].strip()
+
+class IndiceBusqueda:
+    """Índice de trigramas sobre una llave normalizada por fila, construido una vez por versión de datos.
+
+    La llave concatena CAMA, REGISTRO y NOMBRE primero y luego el resto de las columnas, así la
+    búsqueda sigue encontrando cualquier columna visible (p. ej. el tipo de aislamiento).
+    Las consultas de 3+ caracteres solo verifican las filas candidatas del índice; las más cortas
+    recorren la columna de llaves de forma vectorizada.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        columnas = [c for c in COLUMNAS_INDEXADAS if c in df.columns] + [c for c in df.columns if c not in COLUMNAS_INDEXADAS]
+        llave = normalizar(df[columnas[0]]) if columnas else pd.Series([""] * len(df), dtype=str)
+        for col in columnas[1:]:
+            llave = llave + SEPARADOR + normalizar(df[col])
+        self.llaves = llave.reset_index(drop=True)
+
+        postings = {}
+        for pos, texto in enumerate(self.llaves):
+            for gram in {texto[i:i + N] for i in range(len(texto) - N + 1)}:
+                postings.setdefault(gram, []).append(pos)
+        self._postings = {g: np.asarray(p, dtype=np.int64) for g, p in postings.items()}
+
+    def posiciones(self, consulta):
+        """Posiciones (iloc) de las filas que contienen la consulta."""
+        q = normalizar_texto(consulta)
+        if not q:
+            return np.arange(len(self.llaves))
+        if len(q) < N:
+            return np.flatnonzero(self.llaves.str.contains(q, regex=False).to_numpy())
+        listas = []
+        for gram in {q[i:i + N] for i in range(len(q) - N + 1)}:
+            lista = self._postings.get(gram)
+            if lista is None: return np.empty(0, dtype=np.int64)
+            listas.append(lista)
+        listas.sort(key=len)
+        candidatos = listas[0]
+        for lista in listas[1:]:
+            candidatos = np.intersect1d(candidatos, lista, assume_unique=True)
+            if not len(candidatos): return candidatos
+        if len(q) == N:
+            return candidatos
+        coincide = self.llaves.iloc[candidatos].str.contains(q, regex=False).to_numpy()
+        return candidatos[coincide]
+
+    def buscar(self, consulta):
+        return self.df.iloc[self.posiciones(consulta)]
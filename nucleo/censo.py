@@ -0,0 +1,164 @@
+import hashlib
+import re
+from datetime import datetime
+from io import BytesIO
+
+import pandas as pd
+from lxml import etree
+
+from nucleo.diagnostico import cronometrar
+from nucleo.fechas import dias_estancia, parsear_fechas, texto_fecha
+from nucleo.memoria import compactar
+from nucleo.procesos import en_paralelo
+
+# --- CONFIGURACIÓN ---
+IGNORAR = ["PACIENTES", "TOTAL", "SUBTOTAL", "PÁGINA", "IMPRESIÓN", "1111"]
+PATRON_IGNORAR = "|".join(re.escape(x) for x in IGNORAR)
+
+# INGRESO es la FECHA DE INGRESO ya convertida a fecha (NaT si no se pudo leer)
+COLUMNAS_CATEGORICAS = ["SEXO", "ESP_HTML"]
+COLUMNAS_PACIENTE = ["CAMA", "REGISTRO", "PACIENTE", "SEXO", "EDAD", "DIAGNOSTICO", "FECHA DE INGRESO", "INGRESO", "ESP_HTML"]
+
+# --- INGESTA ---
+
+def huella_censo(contenido):
+    """Hash SHA-256 del archivo subido; identifica el censo sin importar el nombre del archivo."""
+    return hashlib.sha256(contenido).hexdigest()
+
+def huella_censos(huellas):
+    """Huella de varios archivos en su orden de subida; con uno solo es la huella del archivo."""
+    if len(huellas) == 1: return huellas[0]
+    return hashlib.sha256("\n".join(huellas).encode()).hexdigest()
+
+def extraer_pacientes(df_raw):
+    """Convierte la tabla cruda del HTML en la tabla estructurada de pacientes (operaciones por columna)."""
+    # Las posiciones 0-9 corresponden al layout del censo del hospital; las faltantes quedan vacías
+    df = df_raw.set_axis(range(df_raw.shape[1]), axis=1).reindex(columns=range(10))
+    txt = {i: df[i].astype(object).where(df[i].notna(), "").astype(str).str.strip() for i in (0, 1, 2, 3, 4, 6, 9)}
+
+    # 1. Filas de encabezado "ESPECIALIDAD:" -> se propagan hacia abajo a los pacientes que siguen
+    col0_upper = txt[0].str.upper()
+    es_encabezado = col0_upper.str.contains("ESPECIALIDAD:", regex=False)
+    esp_html = col0_upper.where(es_encabezado).ffill().fillna("")
+
+    # 2. Ruido (totales, paginación, etc.) y validez del REGISTRO como máscaras completas
+    es_ruido = txt[0].str.contains(PATRON_IGNORAR, regex=True)
+    reg_valido = (txt[1].str.len() >= 5) & txt[1].str.contains(r"\d", regex=True)
+    mask = ~es_encabezado & ~es_ruido & reg_valido
+    ingreso = parsear_fechas(txt[9][mask])
+
+    df_pacs = pd.DataFrame({
+        "CAMA": txt[0][mask], "REGISTRO": txt[1][mask], "PACIENTE": txt[2][mask], "SEXO": txt[3][mask],
+        "EDAD": txt[4][mask].str.replace(r"\D+", "", regex=True), "DIAGNOSTICO": txt[6][mask],
+        "FECHA DE INGRESO": texto_fecha(ingreso, txt[9][mask]), "INGRESO": ingreso, "ESP_HTML": esp_html[mask],
+    }, columns=COLUMNAS_PACIENTE).reset_index(drop=True)
+    return compactar(df_pacs, categoricas=COLUMNAS_CATEGORICAS, enteras=["EDAD"])
+
+def _texto_celda(td):
+    return " ".join("".join(td.itertext()).split())
+
+def iterar_filas(fuente):
+    """Recorre el HTML con iterparse y genera (n_tabla, fila) liberando cada <tr> al terminar.
+
+    Solo se materializan los textos de las celdas; el árbol DOM nunca se construye completo.
+    Las filas formadas únicamente por <th> (encabezados) se omiten, igual que pd.read_html.
+    colspan y rowspan se expanden como en pd.read_html: una celda con rowspan se repite en su
+    misma columna en las filas siguientes de la tabla.
+    """
+    pila_tablas = []
+    n_tablas = 0
+    pendientes = {}  # n_tabla -> [(columna, texto, filas restantes)] de celdas con rowspan
+    for evento, elem in etree.iterparse(fuente, events=("start", "end"), tag=("table", "tr"), html=True, recover=True):
+        if elem.tag == "table":
+            if evento == "start":
+                pila_tablas.append(n_tablas); n_tablas += 1
+            else:
+                pila_tablas.pop(); elem.clear()
+            continue
+        if evento != "end" or not pila_tablas: continue
+        celdas = [c for c in elem if c.tag in ("td", "th")]
+        if celdas and not all(c.tag == "th" for c in celdas):
+            previas = pendientes.pop(pila_tablas[-1], None)
+            fila, siguientes = [], []
+            for c in celdas:
+                # Celdas de filas anteriores con rowspan que caen antes de esta
+                while previas and previas[0][0] <= len(fila):
+                    col, texto_previo, resto = previas.pop(0)
+                    if resto > 1: siguientes.append((col, texto_previo, resto - 1))
+                    fila.append(texto_previo)
+                texto = _texto_celda(c)
+                colspan, rowspan = c.get("colspan"), c.get("rowspan")
+                if colspan is None and rowspan is None:
+                    fila.append(texto); continue
+                rowspan = int(rowspan or 1)
+                for _ in range(int(colspan or 1)):
+                    if rowspan > 1: siguientes.append((len(fila), texto, rowspan - 1))
+                    fila.append(texto)
+            for col, texto_previo, resto in previas or ():
+                if resto > 1: siguientes.append((col, texto_previo, resto - 1))
+                fila.append(texto_previo)
+            if siguientes: pendientes[pila_tablas[-1]] = siguientes
+            yield pila_tablas[-1], fila
+        # Liberar la fila y las hermanas ya procesadas
+        elem.clear()
+        padre = elem.getparent()
+        while padre is not None and elem.getprevious() is not None:
+            del padre[0]
+
+@cronometrar("censo.parseo")
+def leer_censo(contenido):
+    """Parsea el HTML del censo (bytes) y devuelve la tabla de pacientes.
+
+    La tabla de pacientes es la de más filas (mismo criterio que el antiguo max(pd.read_html(...), key=len));
+    las filas de las demás tablas se descartan en cuanto su tabla termina.
+    """
+    mejor, actual, tabla_actual = [], [], None
+    for n_tabla, fila in iterar_filas(BytesIO(contenido)):
+        if n_tabla != tabla_actual:
+            if len(actual) > len(mejor): mejor = actual
+            actual, tabla_actual = [], n_tabla
+        actual.append(fila)
+    if len(actual) > len(mejor): mejor = actual
+    if not mejor:
+        raise ValueError("No se encontró ninguna tabla en el archivo del censo.")
+    return extraer_pacientes(pd.DataFrame(mejor))
+
+def unir_censos(tablas):
+    """Une exportaciones parciales (por torre/piso) en una sola tabla de pacientes.
+
+    Un REGISTRO repetido se queda con la fila del último archivo (el más reciente en el orden de subida).
+    """
+    if len(tablas) == 1: return tablas[0]
+    df = pd.concat(tablas, ignore_index=True)
+    df = df.drop_duplicates("REGISTRO", keep="last").reset_index(drop=True)
+    # Las categorías de cada archivo difieren y concat las deja como texto: se recompacta
+    return compactar(df, categoricas=COLUMNAS_CATEGORICAS, enteras=["EDAD"])
+
+@cronometrar("censo.parseo_varios")
+def leer_censos(contenidos, paralelo=True):
+    """Parsea varios HTML del censo (en el pool de procesos compartido si hay más de uno) y los une."""
+    return unir_censos(en_paralelo(leer_censo, [(c,) for c in contenidos], paralelo))
+
+# --- REPORTE EPIDEMIOLÓGICO ---
+
+@cronometrar("censo.tabla")
+def tabla_epidemiologica(df_pacs, especialidades, orden_terapias, fecha=None):
+    """Filas del Excel epidemiológico para las especialidades elegidas, terapias primero y luego por cama.
+
+    df_pacs es la tabla de pacientes con la columna ESP_REAL ya resuelta. DIAS_ESTANCIA queda vacío
+    cuando la fecha de ingreso no se pudo leer (ver `fechas_invalidas`).
+    """
+    fecha = fecha or datetime.now()
+    df = df_pacs[df_pacs["ESP_REAL"].isin(especialidades)]
+    df_out = pd.DataFrame({
+        "FECHA_REPORTE": fecha.strftime("%d/%m/%Y"), "ESPECIALIDAD": df["ESP_REAL"], "CAMA": df["CAMA"],
+        "REGISTRO": df["REGISTRO"], "PACIENTE": df["PACIENTE"], "SEXO": df["SEXO"], "EDAD": df["EDAD"],
+        "DIAGNOSTICO": df["DIAGNOSTICO"], "FECHA_INGRESO": df["FECHA DE INGRESO"], "DIAS_ESTANCIA": dias_estancia(df["INGRESO"], fecha),
+    }).reset_index(drop=True)
+    otros_servs = sorted([s for s in especialidades if s not in orden_terapias])
+    df_out['ESPECIALIDAD'] = pd.Categorical(df_out['ESPECIALIDAD'], categories=list(orden_terapias) + otros_servs, ordered=True)
+    return df_out.sort_values(['ESPECIALIDAD', 'CAMA'])
+
+def fechas_invalidas(df_pacs):
+    """Pacientes cuya FECHA DE INGRESO no se pudo leer y deben revisarse a mano."""
+    return df_pacs[df_pacs["INGRESO"].isna()]
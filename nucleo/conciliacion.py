@@ -0,0 +1,103 @@
+"""Conciliación de aislamientos sin REGISTRO válido contra el censo, por cama y nombre."""
+import re
+from difflib import SequenceMatcher
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from nucleo.busqueda import normalizar
+
+# --- CONFIGURACIÓN ---
+PESO_NOMBRE = 0.6
+PESO_CAMA = 0.25
+PESO_REGISTRO = 0.15
+
+# Sin la misma cama el máximo es PESO_NOMBRE + PESO_REGISTRO = 0.75: llenar solo exige siempre la
+# misma cama y un nombre idéntico (o casi, si el REGISTRO se parece)
+UMBRAL_AUTOMATICO = 0.85
+UMBRAL_SUGERENCIA = 0.5
+MAX_BLOQUE = 50            # bloques de nombre más grandes que esto no sirven para acotar candidatos
+MAX_FINALISTAS = 5         # candidatos (según tokens en común) que pasan a la comparación fina
+LARGO_MINIMO_TOKEN = 3     # "DE", "LA", etc. no distinguen a nadie
+
+# --- NORMALIZACIÓN ---
+
+def tokens_nombre(nombre):
+    """Tokens del nombre ya normalizado, sin partículas cortas y sin repetir, en orden alfabético."""
+    return sorted({t for t in re.split(r"[^A-Z0-9]+", nombre) if len(t) >= LARGO_MINIMO_TOKEN})
+
+def _similitud(a, b):
+    if not a or not b: return 0.0
+    if a == b: return 1.0
+    m = SequenceMatcher(None, a, b, autojunk=False)
+    return m.ratio() if m.quick_ratio() > 0 else 0.0
+
+# --- ÍNDICE DEL CENSO ---
+
+class IndiceCenso:
+    """Índices de bloqueo sobre el censo (cama, nombre completo, pares de tokens y tokens), construidos una vez.
+
+    Cada aislamiento solo se compara con los pacientes que comparten cama, nombre completo o un par de
+    tokens poco común (o, si ninguno, un token poco común); así el costo crece con las filas y no con su
+    producto. Los candidatos se ordenan por tokens en común y solo los mejores pasan a SequenceMatcher.
+    """
+
+    def __init__(self, df_ref, col_cama="CAMA_HTML", col_nombre="PACIENTE", col_registro="REGISTRO"):
+        self.df = df_ref.reset_index(drop=True)
+        self.camas = normalizar(self.df[col_cama]).str.strip().tolist()
+        self.registros = normalizar(self.df[col_registro]).str.strip().tolist()
+        self.tokens = [tokens_nombre(n) for n in normalizar(self.df[col_nombre])]
+        self.nombres = [" ".join(t) for t in self.tokens]
+        self.conjuntos = [frozenset(t) for t in self.tokens]
+
+        self.por_cama, self.por_nombre, self.por_par, self.por_token = {}, {}, {}, {}
+        for pos, (cama, nombre, tokens) in enumerate(zip(self.camas, self.nombres, self.tokens)):
+            if cama: self.por_cama.setdefault(cama, []).append(pos)
+            if nombre: self.por_nombre.setdefault(nombre, []).append(pos)
+            for par in combinations(tokens, 2): self.por_par.setdefault(par, []).append(pos)
+            for token in tokens: self.por_token.setdefault(token, []).append(pos)
+
+    def candidatos(self, cama, tokens):
+        """Posiciones del censo que comparten la cama, el nombre completo o bloques chicos del nombre."""
+        encontrados = set(self.por_cama.get(cama, ()))
+        encontrados.update(self.por_nombre.get(" ".join(tokens), ()))
+        for indice, llaves in ((self.por_par, combinations(tokens, 2)), (self.por_token, tokens)):
+            utiles = [indice[k] for k in llaves if k in indice and len(indice[k]) <= MAX_BLOQUE]
+            for lista in utiles: encontrados.update(lista)
+            if utiles: break
+        return encontrados
+
+    def puntaje(self, pos, cama, nombre, registro):
+        return (PESO_NOMBRE * _similitud(nombre, self.nombres[pos])
+                + PESO_CAMA * (cama != "" and cama == self.camas[pos])
+                + PESO_REGISTRO * _similitud(registro, self.registros[pos]))
+
+    def mejor(self, cama, nombre, registro):
+        """(posición, puntaje) del mejor candidato del censo; (None, 0.0) si no hay ninguno."""
+        tokens = tokens_nombre(nombre)
+        nombre, conjunto = " ".join(tokens), frozenset(tokens)
+        candidatos = self.candidatos(cama, tokens)
+        if len(candidatos) > MAX_FINALISTAS:
+            # Filtro barato: proporción de tokens en común (Jaccard) más la cama
+            def previo(pos):
+                otro = self.conjuntos[pos]
+                union = len(conjunto | otro)
+                return PESO_NOMBRE * (len(conjunto & otro) / union if union else 0) + PESO_CAMA * (cama == self.camas[pos])
+            candidatos = sorted(candidatos, key=previo, reverse=True)[:MAX_FINALISTAS]
+        mejor_pos, mejor_puntaje = None, 0.0
+        for pos in candidatos:
+            p = self.puntaje(pos, cama, nombre, registro)
+            if p > mejor_puntaje: mejor_pos, mejor_puntaje = pos, p
+        return mejor_pos, mejor_puntaje
+
+    def conciliar(self, camas, nombres, registros):
+        """Mejor candidato por fila: DataFrame con POSICION (iloc en el censo, -1 si ninguno) y PUNTAJE."""
+        filas = [
+            self.mejor(c, n, r)
+            for c, n, r in zip(normalizar(camas).str.strip(), normalizar(nombres), normalizar(registros).str.strip())
+        ]
+        return pd.DataFrame({
+            "POSICION": np.array([-1 if p is None else p for p, _ in filas], dtype=np.int64),
+            "PUNTAJE": np.array([round(s, 3) for _, s in filas], dtype=float),
+        }, index=camas.index)
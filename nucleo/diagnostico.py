@@ -0,0 +1,136 @@
+"""Cronómetros por etapa, bitácora JSON-lines y registro por sesión para el panel de diagnóstico."""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# --- CONFIGURACIÓN ---
+RUTA_LOG = os.environ.get("EPIDEMIO_LOG_TIEMPOS", os.path.join("datos", "tiempos.jsonl"))
+MAX_BYTES_LOG = int(float(os.environ.get("EPIDEMIO_LOG_MAX_MB", "10")) * 1024 * 1024)
+MAX_REGISTROS_SESION = 200
+
+_CANDADO_LOG = threading.Lock()
+_ACTUAL = threading.local()
+
+# --- BITÁCORA ---
+
+def escribir_log(registro, ruta=RUTA_LOG, max_bytes=MAX_BYTES_LOG):
+    """Agrega una línea JSON a la bitácora; un fallo de escritura nunca debe tumbar la página.
+
+    Al pasar de `max_bytes` la bitácora se rota: la actual pasa a `<ruta>.1` (reemplazando la anterior)
+    y se empieza una nueva, así que en disco nunca hay más de dos archivos.
+    """
+    if not ruta: return
+    linea = json.dumps(registro, ensure_ascii=False, default=str)
+    try:
+        with _CANDADO_LOG:
+            os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+            if max_bytes and os.path.exists(ruta) and os.path.getsize(ruta) >= max_bytes:
+                os.replace(ruta, ruta + ".1")
+            with open(ruta, "a", encoding="utf-8") as f:
+                f.write(linea + "\n")
+    except OSError:
+        pass
+
+# --- REGISTRO POR SESIÓN ---
+
+class Diagnostico:
+    """Tiempos (y opcionalmente memoria pico) de cada etapa de una sesión, agrupados por petición (rerun)."""
+
+    def __init__(self, ruta_log=RUTA_LOG):
+        self.id_sesion = uuid.uuid4().hex[:12]
+        self.n_peticion = 0
+        self.id_peticion = None
+        self.pagina = None
+        self.memoria = False
+        self.ruta_log = ruta_log
+        self.registros = deque(maxlen=MAX_REGISTROS_SESION)
+
+    def nueva_peticion(self, pagina=None):
+        """Abre una petición nueva y deja esta sesión como la activa del hilo que corre el script."""
+        self.n_peticion += 1
+        self.id_peticion = f"{self.id_sesion}-{self.n_peticion}"
+        self.pagina = pagina
+        self.activar()
+
+    def activar(self):
+        """Deja esta sesión como la activa del hilo actual (cada rerun de Streamlit corre en un hilo nuevo)."""
+        _ACTUAL.diagnostico = self
+
+    @contextmanager
+    def etapa(self, nombre, **extra):
+        # tracemalloc es global al proceso: solo mide la etapa más externa que lo encendió
+        medir_memoria = self.memoria and not tracemalloc.is_tracing()
+        if medir_memoria: tracemalloc.start()
+        inicio = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            segundos = time.perf_counter() - inicio
+            pico = None
+            if medir_memoria:
+                pico = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+                tracemalloc.stop()
+            registro = {
+                "ts": datetime.now().isoformat(timespec="milliseconds"),
+                "sesion": self.id_sesion,
+                "peticion": self.id_peticion,
+                "pagina": self.pagina,
+                "etapa": nombre,
+                "segundos": round(segundos, 4),
+                "pico_mb": pico,
+                **extra,
+            }
+            if error: registro["error"] = error
+            self.registros.append(registro)
+            escribir_log(registro, self.ruta_log)
+
+    def peticion(self, id_peticion=None):
+        """Registros de una petición (por defecto la actual), en orden de término."""
+        id_peticion = id_peticion or self.id_peticion
+        return [r for r in self.registros if r["peticion"] == id_peticion]
+
+# --- ACCESO DESDE EL CÓDIGO INSTRUMENTADO ---
+
+def actual():
+    """Diagnóstico de la sesión que corre en este hilo (None fuera de la app, p. ej. en el lote)."""
+    return getattr(_ACTUAL, "diagnostico", None)
+
+def etapa(nombre, **extra):
+    """Context manager que cronometra `nombre` en la sesión activa; sin sesión no hace nada."""
+    diag = actual()
+    return diag.etapa(nombre, **extra) if diag else nullcontext()
+
+def en_hilo(funcion):
+    """Envuelve `funcion` para que, corrida en otro hilo (pool), registre sus etapas en la sesión actual."""
+    diag = actual()
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        previo = actual()
+        _ACTUAL.diagnostico = diag
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            _ACTUAL.diagnostico = previo
+    return envoltura
+
+def cronometrar(nombre=None):
+    """Decorador equivalente a `etapa` alrededor de toda la función."""
+    def decorador(funcion):
+        nombre_etapa = nombre or f"{funcion.__module__.split('.')[-1]}.{funcion.__name__}"
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with etapa(nombre_etapa):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,107 @@
+import json
+import re
+from pathlib import Path
+
+import pandas as pd
+
+# --- CONFIGURACIÓN ---
+RUTA_CONFIG = Path(__file__).with_name("especialidades.json")
+
+GRUPO_TERAPIAS = "⚠️ UNIDADES DE TERAPIA ⚠️"
+GRUPO_OTRAS = "OTRAS_ESPECIALIDADES"
+SIN_ESPECIALIDAD = "SIN_ESPECIALIDAD"
+
+# --- ÍNDICE COMPILADO ---
+
+class IndiceEspecialidades:
+    """Reglas de cama, catálogo de coordinaciones y terapias compiladas una sola vez.
+
+    - Prefijos de cama en un trie (dict anidado): la resolución recorre a lo más len(cama) nodos.
+    - Palabras clave de cada coordinación en una sola expresión regular (alternación).
+    - Memo de textos de especialidad ya limpiados y de coordinaciones ya resueltas.
+    """
+
+    def __init__(self, config):
+        self.orden_terapias = list(config["orden_terapias_excel"])
+        self.vinculo_auto_inclusion = {k: list(v) for k, v in config["vinculo_auto_inclusion"].items()}
+        self.catalogo = {k: list(v) for k, v in config["catalogo"].items()}
+        self.prioridad = list(config["prioridad_coordinaciones"])
+        self.prefijos_cama = dict(config["prefijos_cama"])
+        self.rangos = [(r["desde"], r["hasta"], r["especialidad"]) for r in config.get("rangos_cama", [])]
+
+        self._trie = {}
+        for prefijo, esp in self.prefijos_cama.items():
+            nodo = self._trie
+            for ch in prefijo: nodo = nodo.setdefault(ch, {})
+            nodo[""] = esp
+
+        self._terapias = frozenset(self.orden_terapias)
+        self._patrones = [
+            (coord, re.compile("|".join(re.escape(kw) for kw in sorted(self.catalogo[coord], key=len, reverse=True))))
+            for coord in self.prioridad if self.catalogo.get(coord)
+        ]
+        self._memo_html = {}
+        self._memo_coord = {}
+
+    def _por_cama(self, c):
+        nodo, encontrada = self._trie, None
+        for ch in c:
+            nodo = nodo.get(ch)
+            if nodo is None: break
+            encontrada = nodo.get("", encontrada)
+        if encontrada: return encontrada
+        if c.isdigit():
+            n = int(c)
+            for desde, hasta, esp in self.rangos:
+                if desde <= n <= hasta: return esp
+        return None
+
+    def _limpiar_html(self, esp_html):
+        limpia = self._memo_html.get(esp_html)
+        if limpia is None:
+            limpia = esp_html.replace("ESPECIALIDAD:", "").replace("&NBSP;", "").strip().upper() or SIN_ESPECIALIDAD
+            self._memo_html[esp_html] = limpia
+        return limpia
+
+    def resolver(self, cama, esp_html):
+        """Especialidad real de un paciente: las reglas de cama mandan sobre el encabezado del HTML."""
+        return self._por_cama(str(cama).strip().upper()) or self._limpiar_html(esp_html)
+
+    def resolver_columna(self, camas, esps_html):
+        return pd.Categorical([self.resolver(c, e) for c, e in zip(camas, esps_html)])
+
+    def coordinacion(self, esp):
+        """Grupo de la interfaz al que pertenece una especialidad (terapias, coordinación u otras)."""
+        coord = self._memo_coord.get(esp)
+        if coord is None:
+            if esp in self._terapias:
+                coord = GRUPO_TERAPIAS
+            else:
+                coord = next((c for c, patron in self._patrones if patron.search(esp)), GRUPO_OTRAS)
+            self._memo_coord[esp] = coord
+        return coord
+
+    def agrupar(self, especialidades):
+        """Agrupa especialidades en el orden de la interfaz: terapias, coordinaciones por prioridad, otras."""
+        grupos = {}
+        for esp in especialidades: grupos.setdefault(self.coordinacion(esp), []).append(esp)
+        orden = [GRUPO_TERAPIAS] + self.prioridad + [GRUPO_OTRAS]
+        return {g: sorted(grupos[g]) for g in orden if g in grupos}
+
+    def seleccion_final(self, buckets, coordinaciones, servicios, encontradas):
+        """Servicios a reportar: los marcados uno a uno más las terapias vinculadas a cada coordinación completa."""
+        finales = set()
+        for grupo, servs in buckets.items():
+            if grupo in coordinaciones:
+                finales.update(t for t in self.vinculo_auto_inclusion.get(grupo, []) if t in encontradas)
+            finales.update(s for s in servs if s in servicios)
+        return finales
+
+def cargar_indice(ruta=RUTA_CONFIG):
+    with open(ruta, encoding="utf-8") as f:
+        return IndiceEspecialidades(json.load(f))
+
+INDICE = cargar_indice()
+
+def obtener_especialidad_real(cama, esp_html):
+    return INDICE.resolver(cama, esp_html)
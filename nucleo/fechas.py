@@ -0,0 +1,40 @@
+"""Lectura de fechas del censo por columna y días de estancia vectorizados."""
+import pandas as pd
+
+# --- CONFIGURACIÓN ---
+# Se prueban en orden; el primero que entiende un valor gana
+FORMATOS_FECHA = [
+    "%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S",
+    "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y",
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S",
+]
+FORMATO_SALIDA = "%d/%m/%Y"
+
+# --- FECHAS ---
+
+def parsear_fechas(serie, formatos=FORMATOS_FECHA):
+    """Convierte una columna de texto a fechas (sin hora); lo que no se entiende queda NaT.
+
+    Cada formato se prueba solo sobre los valores únicos que siguen sin fecha, y el resultado
+    se reparte a todas las filas con un solo `map`.
+    """
+    texto = serie.astype("string").str.strip()
+    unicos = pd.Series(texto.dropna().unique(), dtype="string")
+    if unicos.empty:
+        return pd.Series(pd.NaT, index=serie.index, dtype="datetime64[ns]")
+    fechas = pd.Series(pd.NaT, index=unicos.index, dtype="datetime64[ns]")
+    for formato in formatos:
+        faltan = fechas.isna()
+        if not faltan.any(): break
+        fechas[faltan] = pd.to_datetime(unicos[faltan], format=formato, errors="coerce")
+    por_texto = pd.Series(fechas.dt.normalize().to_numpy(), index=unicos.to_numpy())
+    return texto.map(por_texto).astype("datetime64[ns]")
+
+def texto_fecha(fechas, original):
+    """Fecha en el formato del hospital; donde no hubo fecha se conserva el texto original."""
+    return fechas.dt.strftime(FORMATO_SALIDA).where(fechas.notna(), original)
+
+def dias_estancia(ingreso, fecha):
+    """Días desde el ingreso hasta `fecha`, contando ambos días (Int64; nulo si no hay fecha de ingreso)."""
+    hoy = pd.Timestamp(fecha).normalize()
+    return ((hoy - ingreso).dt.days + 1).astype("Int64")
@@ -0,0 +1,179 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from nucleo.fechas import parsear_fechas
+
+# --- CONFIGURACIÓN ---
+RUTA_DB = Path(os.environ.get("EPIDEMIO_DB_HISTORICO", Path("datos") / "historico.sqlite"))
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS censos (
+    fecha TEXT PRIMARY KEY,
+    huella TEXT,
+    pacientes INTEGER,
+    aislamientos INTEGER,
+    cargado TEXT
+);
+CREATE TABLE IF NOT EXISTS pacientes (
+    fecha TEXT NOT NULL,
+    registro TEXT NOT NULL,
+    cama TEXT,
+    paciente TEXT,
+    sexo TEXT,
+    edad TEXT,
+    diagnostico TEXT,
+    fecha_ingreso TEXT,  -- AAAA-MM-DD; NULL si no se pudo leer
+    especialidad TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_pacientes_fecha ON pacientes (fecha);
+CREATE INDEX IF NOT EXISTS ix_pacientes_registro ON pacientes (registro, fecha);
+CREATE INDEX IF NOT EXISTS ix_pacientes_cama ON pacientes (cama, fecha);
+CREATE INDEX IF NOT EXISTS ix_pacientes_especialidad ON pacientes (especialidad, fecha);
+CREATE TABLE IF NOT EXISTS aislamientos (
+    fecha TEXT NOT NULL,
+    registro TEXT,
+    cama TEXT,
+    nombre TEXT,
+    tipo TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_aislamientos_fecha ON aislamientos (fecha);
+CREATE INDEX IF NOT EXISTS ix_aislamientos_registro ON aislamientos (registro, fecha);
+"""
+
+def _iso(fecha):
+    return fecha.strftime("%Y-%m-%d") if hasattr(fecha, "strftime") else str(fecha)
+
+# --- ALMACÉN ---
+
+class Historico:
+    """Censos diarios guardados en SQLite, una partición por fecha, con consultas de tendencia.
+
+    Cada fecha se escribe en una sola transacción; volver a cargar la misma fecha reemplaza
+    solo esa partición (una nueva exportación del mismo día), nunca las anteriores.
+    """
+
+    def __init__(self, ruta=RUTA_DB):
+        self.ruta = Path(ruta)
+        self._lock = threading.Lock()
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        with self._conectar() as con:
+            con.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión de corta vida: una transacción y se cierra al salir."""
+        con = sqlite3.connect(self.ruta, timeout=30)
+        try:
+            con.execute("PRAGMA journal_mode=WAL")
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def _consulta(self, sql, params=()):
+        with self._conectar() as con:
+            return pd.read_sql_query(sql, con, params=params)
+
+    # --- INGESTA ---
+
+    def guardar(self, fecha, df_pacs, df_ais=None, huella=None):
+        """Agrega el censo de una fecha (pacientes con ESP_REAL y aislamientos limpios).
+
+        Sin `df_ais` (no se conocen los aislamientos de esa fecha) no se guardan filas y el conteo queda
+        NULL, para que la prevalencia de ese día no cuente como 0 %. Devuelve False si esa fecha ya estaba
+        guardada con la misma huella.
+        """
+        fecha = _iso(fecha)
+        pacientes = pd.DataFrame({
+            "fecha": fecha, "registro": df_pacs["REGISTRO"], "cama": df_pacs["CAMA"], "paciente": df_pacs["PACIENTE"],
+            "sexo": df_pacs["SEXO"], "edad": df_pacs["EDAD"], "diagnostico": df_pacs["DIAGNOSTICO"],
+            "fecha_ingreso": df_pacs["INGRESO"].dt.strftime("%Y-%m-%d"), "especialidad": df_pacs["ESP_REAL"],
+        })
+        n_aislamientos = len(df_ais) if df_ais is not None else None
+        df_ais = df_ais if df_ais is not None else pd.DataFrame(columns=["REGISTRO", "CAMA", "NOMBRE", "TIPO DE AISLAMIENTO"])
+        aislamientos = pd.DataFrame({
+            "fecha": fecha, "registro": df_ais.get("REGISTRO"), "cama": df_ais.get("CAMA"),
+            "nombre": df_ais.get("NOMBRE"), "tipo": df_ais.get("TIPO DE AISLAMIENTO"),
+        })
+        with self._lock, self._conectar() as con:
+            previo = con.execute("SELECT huella FROM censos WHERE fecha = ?", (fecha,)).fetchone()
+            if previo is not None and huella is not None and previo[0] == huella:
+                return False
+            con.execute("DELETE FROM pacientes WHERE fecha = ?", (fecha,))
+            con.execute("DELETE FROM aislamientos WHERE fecha = ?", (fecha,))
+            pacientes.to_sql("pacientes", con, if_exists="append", index=False)
+            aislamientos.to_sql("aislamientos", con, if_exists="append", index=False)
+            con.execute(
+                "INSERT OR REPLACE INTO censos VALUES (?, ?, ?, ?, ?)",
+                (fecha, huella, len(pacientes), n_aislamientos, datetime.now().isoformat(timespec="seconds")),
+            )
+        return True
+
+    # --- CONSULTAS ---
+
+    def fechas(self):
+        return self._consulta("SELECT * FROM censos ORDER BY fecha")
+
+    def ocupacion(self, desde, hasta):
+        """Pacientes por día y especialidad."""
+        return self._consulta(
+            "SELECT fecha, especialidad, COUNT(*) AS pacientes FROM pacientes "
+            "WHERE fecha BETWEEN ? AND ? GROUP BY fecha, especialidad ORDER BY fecha",
+            (_iso(desde), _iso(hasta)),
+        )
+
+    def estancias(self, desde, hasta, especialidad=None):
+        """Días de estancia por paciente (desde su FECHA DE INGRESO hasta el último censo en que aparece)."""
+        sql = ("SELECT registro, especialidad, MIN(fecha) AS primera, MAX(fecha) AS ultima, MIN(fecha_ingreso) AS fecha_ingreso "
+               "FROM pacientes WHERE fecha BETWEEN ? AND ?")
+        params = [_iso(desde), _iso(hasta)]
+        if especialidad:
+            sql += " AND especialidad = ?"; params.append(especialidad)
+        df = self._consulta(sql + " GROUP BY registro, especialidad", params)
+        ingreso = parsear_fechas(df["fecha_ingreso"])
+        ingreso = ingreso.fillna(pd.to_datetime(df["primera"]))
+        df["dias_estancia"] = (pd.to_datetime(df["ultima"]) - ingreso).dt.days + 1
+        return df
+
+    def prevalencia_aislamientos(self, desde, hasta):
+        """Aislamientos activos, pacientes y prevalencia (%) por día."""
+        df = self._consulta(
+            "SELECT fecha, pacientes, aislamientos FROM censos WHERE fecha BETWEEN ? AND ? ORDER BY fecha",
+            (_iso(desde), _iso(hasta)),
+        )
+        # Los días guardados sin aislamientos (NULL) quedan sin prevalencia en vez de 0 %
+        df["aislamientos"] = pd.to_numeric(df["aislamientos"])
+        df["prevalencia"] = (100 * df["aislamientos"] / df["pacientes"].where(df["pacientes"] > 0)).round(2)
+        return df
+
+    def movimientos(self, fecha):
+        """Ingresos, egresos y traslados (cambio de cama o especialidad) contra el censo anterior guardado."""
+        fecha = _iso(fecha)
+        previa = self._consulta("SELECT MAX(fecha) AS f FROM censos WHERE fecha < ?", (fecha,))["f"].iat[0]
+        columnas = "registro, cama, paciente, especialidad"
+        hoy = self._consulta(f"SELECT {columnas} FROM pacientes WHERE fecha = ?", (fecha,)).drop_duplicates("registro")
+        ayer = self._consulta(f"SELECT {columnas} FROM pacientes WHERE fecha = ?", (previa,)).drop_duplicates("registro") if previa else hoy.iloc[:0]
+        cruce = hoy.merge(ayer, on="registro", how="outer", suffixes=("", "_anterior"), indicator=True)
+        ingresos = cruce[cruce["_merge"] == "left_only"][["registro", "cama", "paciente", "especialidad"]]
+        egresos = cruce[cruce["_merge"] == "right_only"][["registro", "cama_anterior", "paciente_anterior", "especialidad_anterior"]]
+        ambos = cruce[cruce["_merge"] == "both"]
+        traslados = ambos[(ambos["cama"] != ambos["cama_anterior"]) | (ambos["especialidad"] != ambos["especialidad_anterior"])]
+        traslados = traslados[["registro", "paciente", "cama_anterior", "cama", "especialidad_anterior", "especialidad"]]
+        return {"fecha_anterior": previa, "ingresos": ingresos, "egresos": egresos, "traslados": traslados}
+
+_historico = None
+_historico_lock = threading.Lock()
+
+def historico():
+    """Almacén compartido del proceso (se crea al primer uso)."""
+    global _historico
+    with _historico_lock:
+        if _historico is None:
+            _historico = Historico()
+        return _historico
@@ -0,0 +1,128 @@
+import pandas as pd
+
+from nucleo.censo import PATRON_IGNORAR
+from nucleo.conciliacion import UMBRAL_AUTOMATICO, UMBRAL_SUGERENCIA, IndiceCenso
+from nucleo.diagnostico import cronometrar
+from nucleo.especialidades import INDICE
+from nucleo.memoria import actualizar, compactar
+
+# --- CONFIGURACIÓN ---
+SERVICIOS_INSUMOS_FILTRO = [
+    "HEMATOLOGIA", "HEMATOLOGIA PEDIATRICA", "ONCOLOGIA PEDIATRICA",
+    "NEONATOLOGIA", "INFECTOLOGIA PEDIATRICA", "U.C.I.N.",
+    "U.T.I.P.", "TERAPIA POSQUIRURGICA", "UNIDAD DE QUEMADOS",
+    "ONCOLOGIA MEDICA", "UCIA"
+]
+
+COLUMNAS_CATEGORICAS = ["SEXO", "TIPO DE PRECAUCIONES", "INSUMO"]
+COLUMNAS_COMPLETAR = ["SEXO", "EDAD", "FECHA DE INGRESO"]
+COLUMNAS_OFICIALES = ["CAMA", "REGISTRO", "PACIENTE", "SEXO", "EDAD", "FECHA DE INGRESO", "TIPO DE PRECAUCIONES", "INSUMO"]
+INSUMO_DEFAULT = "JABÓN/SANITAS"
+PRECAUCION_DEFAULT = "ESTÁNDAR"
+PENDIENTE = "Pendiente"
+
+RUIDO_AISLAMIENTOS = ["1111", "PACIENTES", "TOTAL", "SUBTOTAL"]
+
+# --- CENSO ---
+
+def referencia_censo(df_censo):
+    """Pacientes del censo con su especialidad real, para cruzar con los aislamientos por REGISTRO."""
+    df_ref = df_censo[~df_censo["REGISTRO"].str.contains(PATRON_IGNORAR)]
+    return df_ref.rename(columns={"CAMA": "CAMA_HTML"}).drop(columns=["DIAGNOSTICO", "ESP_HTML"]).assign(
+        ESP_REAL=INDICE.resolver_columna(df_ref["CAMA"], df_ref["ESP_HTML"])
+    )
+
+def pacientes_servicios(df_ref):
+    """Pacientes de los servicios con insumos (SERVICIOS_INSUMOS_FILTRO)."""
+    return df_ref[df_ref["ESP_REAL"].isin(SERVICIOS_INSUMOS_FILTRO)]
+
+def tablas_servicios(df_11):
+    """Tabla oficial de cada servicio, en orden alfabético."""
+    tablas = {}
+    for serv in sorted(df_11["ESP_REAL"].unique()):
+        df_s = df_11[df_11["ESP_REAL"] == serv].rename(columns={"CAMA_HTML": "CAMA"})
+        df_s = df_s.assign(**{"TIPO DE PRECAUCIONES": PRECAUCION_DEFAULT, "INSUMO": INSUMO_DEFAULT})
+        tablas[serv] = compactar(df_s[COLUMNAS_OFICIALES], categoricas=COLUMNAS_CATEGORICAS)
+    return tablas
+
+# --- AISLAMIENTOS ---
+
+def limpiar_aislamientos(df_ais):
+    """Recorta los aislamientos consolidados a las columnas de Insumos y quita el ruido."""
+    cols = ["CAMA", "REGISTRO", "NOMBRE", "TIPO DE AISLAMIENTO", "FECHA DE TÉRMINO"]
+    df_ais = df_ais[[c for c in cols if c in df_ais.columns]]
+    df_ais = df_ais[~df_ais["REGISTRO"].str.contains('|'.join(RUIDO_AISLAMIENTOS), na=False)]
+    return df_ais.dropna(subset=["REGISTRO"])
+
+@cronometrar("insumos.cruce")
+def mapear_aislamientos(df_base, df_ref, conciliar=True, indice=None):
+    """Completa los aislamientos con los datos del censo por REGISTRO; lo que falte queda "Pendiente".
+
+    Con `conciliar`, las filas sin REGISTRO en el censo toman SEXO/EDAD/FECHA DE INGRESO del paciente
+    que coincide por cama y nombre si la confianza supera UMBRAL_AUTOMATICO. `indice` permite reutilizar
+    el IndiceCenso de este mismo df_ref.
+    """
+    if df_base.empty:
+        return pd.DataFrame()
+    df_f = pd.merge(df_base, df_ref, on="REGISTRO", how="left")
+    for c in COLUMNAS_COMPLETAR: df_f[c] = df_f[c].astype("string")
+
+    sin_cruce = df_f["CAMA_HTML"].isna()
+    if conciliar and sin_cruce.any() and not df_ref.empty:
+        df_s = df_f[sin_cruce]
+        res = (indice or IndiceCenso(df_ref)).conciliar(df_s["CAMA"], df_s["NOMBRE"], df_s["REGISTRO"])
+        auto = res[res["PUNTAJE"] >= UMBRAL_AUTOMATICO]
+        for c in COLUMNAS_COMPLETAR:
+            df_f.loc[auto.index, c] = df_ref[c].astype("string").to_numpy()[auto["POSICION"].to_numpy()]
+
+    df_f["CAMA"] = df_f["CAMA_HTML"].fillna(df_f["CAMA"])
+    df_f["PACIENTE"] = df_f["PACIENTE"].fillna(df_f["NOMBRE"])
+    df_f["TIPO DE PRECAUCIONES"] = df_f["TIPO DE AISLAMIENTO"]
+    df_f["INSUMO"] = INSUMO_DEFAULT
+    for c in COLUMNAS_COMPLETAR: df_f[c] = df_f[c].fillna(PENDIENTE)
+    return compactar(df_f[COLUMNAS_OFICIALES], categoricas=COLUMNAS_CATEGORICAS)
+
+@cronometrar("insumos.sugerencias")
+def sugerencias_pendientes(df_mapeado, df_ref, umbral=UMBRAL_SUGERENCIA, indice=None):
+    """Posible paciente del censo para cada fila pendiente (por cama y nombre), con su puntaje.
+
+    El índice es el de df_mapeado, para poder aplicar la sugerencia con `aplicar_ediciones`.
+    """
+    columnas = ["CAMA", "PACIENTE", "CAMA_CENSO", "REGISTRO_CENSO", "PACIENTE_CENSO"] + COLUMNAS_COMPLETAR + ["PUNTAJE"]
+    df_p = df_mapeado[filas_pendientes(df_mapeado)] if not df_mapeado.empty else df_mapeado
+    if df_p.empty or df_ref.empty:
+        return pd.DataFrame(columns=columnas)
+    res = (indice or IndiceCenso(df_ref)).conciliar(df_p["CAMA"], df_p["PACIENTE"], df_p["REGISTRO"])
+    res = res[res["PUNTAJE"] >= umbral]
+    censo = df_ref.iloc[res["POSICION"].to_numpy()]
+    return pd.DataFrame({
+        "CAMA": df_p.loc[res.index, "CAMA"], "PACIENTE": df_p.loc[res.index, "PACIENTE"],
+        "CAMA_CENSO": censo["CAMA_HTML"].to_numpy(), "REGISTRO_CENSO": censo["REGISTRO"].to_numpy(),
+        "PACIENTE_CENSO": censo["PACIENTE"].to_numpy(),
+        **{c: censo[c].astype("string").to_numpy() for c in COLUMNAS_COMPLETAR},
+        "PUNTAJE": res["PUNTAJE"],
+    }, index=res.index, columns=columnas).sort_values("PUNTAJE", ascending=False)
+
+# --- EDICIÓN MANUAL ---
+
+def filas_pendientes(df_mapeado):
+    """Máscara de los aislamientos a los que aún les falta algún dato del censo."""
+    return df_mapeado[COLUMNAS_COMPLETAR].astype(object).eq(PENDIENTE).any(axis=1)
+
+def aplicar_ediciones(df_mapeado, etiquetas, filas_editadas):
+    """Aplica en su lugar el delta de `st.data_editor` (posición -> {columna: valor}) solo a las filas tocadas.
+
+    `etiquetas` es el índice de las filas que se mostraron en el editor. Devuelve cuántas filas cambiaron.
+    """
+    if not filas_editadas:
+        return 0
+    cambios = pd.DataFrame.from_dict({etiquetas[int(p)]: c for p, c in filas_editadas.items()}, orient="index")
+    actualizar(df_mapeado, cambios)
+    return len(cambios)
+
+def aplicar_sugerencias(df_mapeado, df_sugerencias):
+    """Copia SEXO/EDAD/FECHA DE INGRESO de las sugerencias aceptadas (mismo índice que df_mapeado)."""
+    if df_sugerencias.empty:
+        return 0
+    actualizar(df_mapeado, df_sugerencias[COLUMNAS_COMPLETAR].astype(object))
+    return len(df_sugerencias)
@@ -0,0 +1,167 @@
+"""Generación de reportes sin interfaz para uno o varios censos HTML.
+
+Uso:
+    python -m nucleo.lote CARPETA_O_ARCHIVOS... --salida reportes --coordinaciones COORD_MEDICINA
+    python -m nucleo.lote censos/ --todas --procesos 8 --aislamientos aislamientos.csv
+"""
+import argparse
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+from nucleo.aislamientos import FuenteAislamientos, consolidar_aislamientos
+from nucleo.censo import huella_censo, leer_censo, tabla_epidemiologica
+from nucleo.especialidades import INDICE
+from nucleo.historico import RUTA_DB, Historico
+from nucleo.insumos import limpiar_aislamientos, mapear_aislamientos, pacientes_servicios, referencia_censo, tablas_servicios
+from nucleo.reportes import excel_censo, excel_insumos, pdf_insumos
+
+# --- CONFIGURACIÓN ---
+REPORTES = ["censo", "insumos", "pdf"]
+EXTENSIONES = (".html", ".htm")
+
+PATRONES_FECHA = [
+    (re.compile(r"(\d{4})[-_.](\d{2})[-_.](\d{2})"), (1, 2, 3)),
+    (re.compile(r"(\d{2})[-_.](\d{2})[-_.](\d{4})"), (3, 2, 1)),
+    (re.compile(r"(?<!\d)(\d{2})(\d{2})(\d{4})(?!\d)"), (3, 2, 1)),
+]
+
+# --- UTILIDADES ---
+
+def fecha_de_archivo(ruta):
+    """Fecha del censo tomada del nombre del archivo (aaaa-mm-dd, dd-mm-aaaa o ddmmaaaa); None si no trae."""
+    for patron, (a, m, d) in PATRONES_FECHA:
+        for coincidencia in patron.finditer(Path(ruta).stem):
+            try:
+                return datetime(int(coincidencia.group(a)), int(coincidencia.group(m)), int(coincidencia.group(d)))
+            except ValueError:
+                continue
+    return None
+
+def listar_censos(entradas):
+    archivos = []
+    for entrada in map(Path, entradas):
+        if entrada.is_dir():
+            archivos.extend(sorted(p for p in entrada.iterdir() if p.suffix.lower() in EXTENSIONES))
+        else:
+            archivos.append(entrada)
+    return archivos
+
+def cargar_aislamientos(origen):
+    """Aislamientos limpios desde un CSV local, una URL o la hoja publicada (origen=None)."""
+    if origen and Path(origen).exists():
+        contenido = Path(origen).read_bytes()
+    else:
+        contenido = (FuenteAislamientos(origen) if origen else FuenteAislamientos()).obtener()
+    return limpiar_aislamientos(consolidar_aislamientos(contenido))
+
+# --- PROCESO DE UN CENSO ---
+
+def procesar_censo(ruta, salida, coordinaciones=(), servicios=(), todas=False, df_ais=None, fecha=None, reportes=REPORTES, ruta_historico=None, ais_explicitos=False):
+    """Genera los reportes de un censo (y opcionalmente lo agrega al histórico); devuelve las rutas escritas.
+
+    Los aislamientos (reportes de Insumos e histórico) solo se usan si el censo es de hoy o si
+    `ais_explicitos` (el CSV de --aislamientos corresponde a esa fecha); en otro caso el censo se
+    procesa sin aislamientos.
+    """
+    fecha = fecha or fecha_de_archivo(ruta) or datetime.now()
+    sufijo = fecha.strftime('%d%m%Y')
+    salida = Path(salida)
+    salida.mkdir(parents=True, exist_ok=True)
+    escritos = []
+
+    contenido = Path(ruta).read_bytes()
+    df_censo = leer_censo(contenido)
+    df_pacs = df_censo.assign(ESP_REAL=INDICE.resolver_columna(df_censo["CAMA"], df_censo["ESP_HTML"]))
+
+    # La hoja publicada solo refleja los aislamientos de hoy: no se atribuyen a fechas pasadas
+    ais_del_dia = df_ais if ais_explicitos or fecha.date() == date.today() else None
+    if df_ais is not None and ais_del_dia is None:
+        print(f"⚠️ {Path(ruta).name}: censo del {fecha:%d/%m/%Y}, se procesa sin aislamientos (usa --aislamientos con el CSV de esa fecha).", file=sys.stderr)
+
+    if ruta_historico:
+        Historico(ruta_historico).guardar(fecha, df_pacs, ais_del_dia, huella_censo(contenido))
+
+    if "censo" in reportes:
+        encontradas = set(df_pacs["ESP_REAL"])
+        buckets = INDICE.agrupar(encontradas)
+        coords = set(buckets) if todas else set(coordinaciones)
+        # Marcar una coordinación equivale a "Seleccionar todo" en la interfaz
+        servs = set(servicios) | {s for c in coords for s in buckets.get(c, [])}
+        finales = INDICE.seleccion_final(buckets, coords, servs, encontradas)
+        df_out = tabla_epidemiologica(df_pacs, finales, INDICE.orden_terapias, fecha)
+        if not df_out.empty:
+            destino = salida / f"Censo_Epidemio_{sufijo}.xlsx"
+            destino.write_bytes(excel_censo(df_out))
+            escritos.append(destino)
+
+    if {"insumos", "pdf"} & set(reportes):
+        df_ref = referencia_censo(df_censo)
+        dict_servicios = tablas_servicios(pacientes_servicios(df_ref))
+        df_ais_mapeado = mapear_aislamientos(ais_del_dia if ais_del_dia is not None else pd.DataFrame(), df_ref)
+        if "insumos" in reportes:
+            destino = salida / f"Insumos_Epidemio_{sufijo}.xlsx"
+            destino.write_bytes(excel_insumos(df_ais_mapeado, dict_servicios, fecha))
+            escritos.append(destino)
+        if "pdf" in reportes:
+            destino = salida / f"Insumos_Epidemio_{sufijo}.pdf"
+            # Dentro de un proceso del lote el PDF se renderiza en serie (sin pool anidado)
+            destino.write_bytes(pdf_insumos(df_ais_mapeado, dict_servicios, fecha, paralelo=False))
+            escritos.append(destino)
+    return escritos
+
+# --- ENTRADA DE LÍNEA DE COMANDOS ---
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m nucleo.lote", description="Genera los reportes de EpidemioManager para varios censos HTML.")
+    parser.add_argument("entradas", nargs="+", help="Archivos HTML del censo o carpetas que los contienen.")
+    parser.add_argument("--salida", default="reportes", help="Carpeta de salida (una subcarpeta por censo).")
+    parser.add_argument("--coordinaciones", nargs="*", default=[], metavar="COORD", help="Coordinaciones completas a incluir (p. ej. COORD_MEDICINA).")
+    parser.add_argument("--servicios", nargs="*", default=[], metavar="SERVICIO", help="Servicios sueltos a incluir en el censo epidemiológico.")
+    parser.add_argument("--todas", action="store_true", help="Incluir todas las coordinaciones.")
+    parser.add_argument("--reportes", nargs="*", default=REPORTES, choices=REPORTES, help="Reportes a generar.")
+    parser.add_argument("--aislamientos", help="CSV local o URL de aislamientos; se usa para todas las fechas del lote. La hoja publicada (por defecto) solo se usa en censos de hoy.")
+    parser.add_argument("--sin-aislamientos", action="store_true", help="No descargar aislamientos.")
+    parser.add_argument("--fecha", help="Fecha del reporte dd/mm/aaaa (por defecto la del nombre del archivo o hoy).")
+    parser.add_argument("--historico", nargs="?", const=str(RUTA_DB), metavar="RUTA_DB", help="Agregar cada censo al histórico SQLite.")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo (por defecto, uno por núcleo).")
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    archivos = listar_censos(args.entradas)
+    if not archivos:
+        print("No se encontraron censos HTML.", file=sys.stderr)
+        return 1
+    fecha = datetime.strptime(args.fecha, "%d/%m/%Y") if args.fecha else None
+
+    df_ais = None
+    if not args.sin_aislamientos and ({"insumos", "pdf"} & set(args.reportes) or args.historico):
+        # Se descarga y consolida una sola vez para todo el lote
+        df_ais = cargar_aislamientos(args.aislamientos)
+
+    errores = 0
+    with ProcessPoolExecutor(max_workers=args.procesos) as pool:
+        futuros = {
+            pool.submit(
+                procesar_censo, ruta, Path(args.salida) / ruta.stem, args.coordinaciones, args.servicios,
+                args.todas, df_ais, fecha, args.reportes, args.historico, args.aislamientos is not None,
+            ): ruta
+            for ruta in archivos
+        }
+        for futuro in as_completed(futuros):
+            ruta = futuros[futuro]
+            try:
+                escritos = futuro.result()
+                print(f"✅ {ruta.name}: {', '.join(p.name for p in escritos) or 'sin reportes'}")
+            except Exception as e:
+                errores += 1
+                print(f"❌ {ruta.name}: {e}", file=sys.stderr)
+    return 1 if errores else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
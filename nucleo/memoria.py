@@ -0,0 +1,72 @@
+"""Representación compacta de las tablas en memoria y reporte del consumo por sesión."""
+import sys
+
+import numpy as np
+import pandas as pd
+
+# --- COMPACTACIÓN ---
+
+def internar(serie):
+    """Comparte un solo objeto por texto repetido en columnas de objetos Python (no afecta a Arrow)."""
+    if isinstance(serie.dtype, pd.StringDtype) and serie.dtype.storage != "python":
+        return serie
+    codigos, unicos = pd.factorize(serie)
+    valores = pd.api.extensions.take(unicos, codigos, allow_fill=True)
+    return pd.Series(valores, index=serie.index, name=serie.name, dtype=serie.dtype)
+
+def entero(serie):
+    """Texto numérico a entero nullable del menor tamaño posible; si algún valor no es número se deja igual."""
+    texto = serie.astype("string").str.strip().replace("", pd.NA)
+    numeros = pd.to_numeric(texto, errors="coerce")
+    if numeros.isna().sum() != texto.isna().sum():
+        return serie
+    minimo, maximo = (numeros.min(), numeros.max()) if numeros.notna().any() else (0, 0)
+    for tipo in (np.int8, np.int16, np.int32, np.int64):
+        if np.iinfo(tipo).min <= minimo and maximo <= np.iinfo(tipo).max:
+            return numeros.astype(f"Int{np.iinfo(tipo).bits}")
+    return serie
+
+def compactar(df, categoricas=(), enteras=()):
+    """Aplica el esquema compacto: categorías para columnas de pocos valores, enteros donde todo es número
+    y textos internados en el resto de columnas de objetos."""
+    cambios = {}
+    for col in df.columns:
+        if col in categoricas:
+            cambios[col] = df[col].astype("category")
+        elif col in enteras:
+            cambios[col] = entero(df[col])
+        elif df[col].dtype == object or isinstance(df[col].dtype, pd.StringDtype):
+            cambios[col] = internar(df[col])
+    return df.assign(**cambios)
+
+def actualizar(df, cambios):
+    """`DataFrame.update` que acepta valores nuevos en columnas categóricas (agrega la categoría)."""
+    for col in cambios.columns.intersection(df.columns):
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            nuevos = pd.Index(cambios[col].dropna().unique()).difference(df[col].cat.categories)
+            if len(nuevos): df[col] = df[col].cat.add_categories(nuevos)
+        elif pd.api.types.is_integer_dtype(df[col].dtype) and not pd.api.types.is_integer_dtype(cambios[col].dtype):
+            df[col] = df[col].astype(object)
+    df.update(cambios)
+
+# --- REPORTE ---
+
+def tamano(objeto):
+    """Bytes que ocupa un objeto de la sesión (profundo para DataFrames y archivos subidos)."""
+    if isinstance(objeto, (pd.DataFrame, pd.Series)):
+        uso = objeto.memory_usage(deep=True, index=True)
+        return int(uso.sum() if isinstance(objeto, pd.DataFrame) else uso)
+    if isinstance(objeto, dict):
+        return sum(tamano(v) for v in objeto.values()) + sys.getsizeof(objeto)
+    if hasattr(objeto, "getbuffer"):
+        return objeto.getbuffer().nbytes
+    return sys.getsizeof(objeto)
+
+def reporte_sesion(estado, compartidos=()):
+    """Tabla con el tamaño (MB) de cada objeto guardado en la sesión; `compartidos` marca los que viven
+    en el caché del proceso y no cuentan por usuario."""
+    filas = [
+        {"Objeto": str(k), "Tipo": type(v).__name__, "MB": round(tamano(v) / 1e6, 3), "Compartido": k in compartidos}
+        for k, v in estado.items()
+    ]
+    return pd.DataFrame(filas, columns=["Objeto", "Tipo", "MB", "Compartido"]).sort_values("MB", ascending=False)
@@ -0,0 +1,38 @@
+"""Pool de procesos compartido por el trabajo de CPU de la app (secciones del PDF, parseo de censos)."""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# --- CONFIGURACIÓN ---
+MAX_PROCESOS = min(4, os.cpu_count() or 1)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# --- POOL ---
+
+def _pool_procesos():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn" evita heredar los hilos del servidor de Streamlit al crear procesos
+            _pool = ProcessPoolExecutor(max_workers=MAX_PROCESOS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def en_paralelo(funcion, tareas, paralelo=True):
+    """[funcion(*args) for args in tareas], en el pool si hay más de una tarea y más de un núcleo.
+
+    Si el pool se rompe (un proceso murió, sin recursos del sistema) se descarta y se corre en serie.
+    `funcion` y sus argumentos deben poder enviarse a otro proceso (funciones de módulo).
+    """
+    tareas = list(tareas)
+    if paralelo and len(tareas) > 1 and MAX_PROCESOS > 1:
+        try:
+            futuros = [_pool_procesos().submit(funcion, *args) for args in tareas]
+            return [f.result() for f in futuros]
+        except (BrokenProcessPool, OSError):
+            global _pool
+            with _pool_lock: _pool = None
+    return [funcion(*args) for args in tareas]
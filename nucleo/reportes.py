@@ -0,0 +1,275 @@
+import threading
+import warnings
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pandas as pd
+from pypdf import PdfWriter
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table as RLTable, TableStyle, Paragraph, Spacer
+
+from nucleo.artefactos import huella_df
+from nucleo.diagnostico import cronometrar
+from nucleo.procesos import en_paralelo
+
+# --- CONFIGURACIÓN ---
+ANCHO_MAXIMO = 50
+
+LEYENDA_NOM045 = "Comentario: de acuerdo con la Norma Oficial Mexicana NOM-045-SSA2-2005, Para la vigilancia epidemiológica, prevención y control de las infecciones nosocomiales. NINGUN RECIPIENTE QUE CONTENGA EL INSUMO DEBERÁ SER RELLENADO O REUTILIZADO."
+FIRMA_AUTORIZA = "AUTORIZÓ: DRA. BRENDA CASTILLO MATUS"
+DIAS_VIGENCIA = 7
+
+MAX_SECCIONES_PDF_EN_CACHE = 256
+
+# --- EXCEL DEL CENSO EPIDEMIOLÓGICO ---
+
+def _estilo_celda_censo():
+    thin = Side(style='thin')
+    return NamedStyle(
+        name="censo_celda",
+        border=Border(left=thin, right=thin, top=thin, bottom=thin),
+        alignment=Alignment(wrap_text=True, vertical="center", horizontal="center"),
+    )
+
+def anchos_columnas(df, maximo=ANCHO_MAXIMO):
+    """Ancho por columna: el texto más largo (encabezado incluido) + 2, calculado por columna completa."""
+    texto = df.astype(object).where(df.notna(), "").astype(str)
+    largos = texto.apply(lambda s: s.str.len()).max().fillna(0).astype(int).tolist() if len(df) else [0] * df.shape[1]
+    return [min(max(largo, len(str(c))) + 2, maximo) for c, largo in zip(df.columns, largos)]
+
+@cronometrar("reportes.excel_censo")
+def excel_censo(df, hoja="Epidemiologia", tabla="CensoTable"):
+    """Escribe el censo ya estilizado en una sola pasada (modo write-only, sin recargar el libro)."""
+    wb = Workbook(write_only=True)
+    estilo = _estilo_celda_censo()
+    wb.add_named_style(estilo)
+    ws = wb.create_sheet(hoja)
+
+    for i, ancho in enumerate(anchos_columnas(df), 1):
+        ws.column_dimensions[get_column_letter(i)].width = ancho
+
+    def fila(valores):
+        celdas = []
+        for v in valores:
+            c = WriteOnlyCell(ws, value=v)
+            c.style = estilo.name
+            celdas.append(c)
+        return celdas
+
+    encabezados = [str(c) for c in df.columns]
+    ws.append(fila(encabezados))
+    for valores in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+        ws.append(fila(valores))
+
+    ref = f"A1:{get_column_letter(max(len(encabezados), 1))}{len(df) + 1}"
+    tab = Table(displayName=tabla, ref=ref)
+    tab.tableStyleInfo = TableStyleInfo(name="TableStyleMedium9", showRowStripes=True)
+    # En modo write-only los nombres de columna de la tabla se declaran a mano
+    tab.tableColumns = [TableColumn(id=i, name=nombre) for i, nombre in enumerate(encabezados or ["Column1"], 1)]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        ws.add_table(tab)
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+# --- EXCEL OFICIAL DE INSUMOS ---
+
+def rango_vigencia(hoy=None):
+    """Fechas (hoy, vencimiento) del formato oficial en dd/mm/aaaa."""
+    hoy = hoy or datetime.now()
+    return hoy.strftime("%d/%m/%Y"), (hoy + timedelta(days=DIAS_VIGENCIA)).strftime("%d/%m/%Y")
+
+class PlantillaOficial:
+    """Formato oficial de Insumos (título, encabezado azul, NOM-045 y firma) definido una sola vez.
+
+    Los estilos se registran una vez por libro como NamedStyle y cada hoja solo escribe
+    sus celdas de datos entre los bloques de encabezado y pie ya preparados.
+    """
+
+    COLUMNAS = 8
+    ANCHO = 20
+
+    def __init__(self, hoy=None):
+        self.f_hoy, self.f_venc = rango_vigencia(hoy)
+        thin = Side(style='thin')
+        borde = Border(left=thin, right=thin, top=thin, bottom=thin)
+        centro = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        self.estilos = {
+            "titulo": NamedStyle(name="oficial_titulo", font=Font(bold=True, size=11), alignment=centro),
+            "encabezado": NamedStyle(name="oficial_encabezado", font=Font(color="FFFFFF", bold=True), alignment=centro, border=borde,
+                                     fill=PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")),
+            "celda": NamedStyle(name="oficial_celda", alignment=centro, border=borde),
+            "leyenda": NamedStyle(name="oficial_leyenda", font=Font(size=9, italic=True), alignment=centro),
+            "firma": NamedStyle(name="oficial_firma", font=Font(bold=True), alignment=centro),
+        }
+
+    def nuevo_libro(self):
+        wb = Workbook(write_only=True)
+        for estilo in self.estilos.values():
+            wb.add_named_style(estilo)
+        return wb
+
+    def titulo(self, servicio_nombre):
+        return f"{servicio_nombre} DEL {self.f_hoy} AL {self.f_venc} (PARA LOS 3 TURNOS Y FINES DE SEMANA)"
+
+    def _fila(self, ws, valores, estilo):
+        celdas = []
+        for v in valores:
+            c = WriteOnlyCell(ws, value=v)
+            c.style = self.estilos[estilo].name
+            celdas.append(c)
+        return celdas
+
+    def _fila_unida(self, ws, n_fila, valor, estilo):
+        ultima = get_column_letter(self.COLUMNAS)
+        ws.merged_cells.add(f"A{n_fila}:{ultima}{n_fila}")
+        return self._fila(ws, [valor], estilo)
+
+    def escribir_hoja(self, wb, nombre_hoja, df, servicio_nombre):
+        ws = wb.create_sheet(nombre_hoja)
+        for i in range(1, self.COLUMNAS + 1):
+            ws.column_dimensions[get_column_letter(i)].width = self.ANCHO
+        fila_leyenda = len(df) + 3
+        # En modo write-only la altura se declara antes de escribir la fila
+        ws.row_dimensions[fila_leyenda].height = 50
+
+        ws.append(self._fila_unida(ws, 1, self.titulo(servicio_nombre), "titulo"))
+        ws.append(self._fila(ws, [str(c) for c in df.columns], "encabezado"))
+        for valores in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+            ws.append(self._fila(ws, valores, "celda"))
+        ws.append(self._fila_unida(ws, fila_leyenda, LEYENDA_NOM045, "leyenda"))
+        ws.append(self._fila_unida(ws, fila_leyenda + 1, FIRMA_AUTORIZA, "firma"))
+        return ws
+
+def nombre_hoja(servicio):
+    return servicio[:30].replace("/", "-")
+
+@cronometrar("reportes.excel_insumos")
+def excel_insumos(df_ais, dict_especialidades, hoy=None):
+    """Libro oficial de Insumos: hoja AISLAMIENTOS y una hoja por servicio."""
+    plantilla = PlantillaOficial(hoy)
+    wb = plantilla.nuevo_libro()
+    plantilla.escribir_hoja(wb, "AISLAMIENTOS", df_ais, "INSUMOS AISLAMIENTOS")
+    for serv, df_s in dict_especialidades.items():
+        plantilla.escribir_hoja(wb, nombre_hoja(serv), df_s, f"INSUMOS {serv}")
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+# --- PDF DE INSUMOS ---
+
+def _pdf_seccion(nombre_tit, columnas, filas, f_rango):
+    """Renderiza las páginas de un servicio (título, tabla, NOM-045 y firma) como un PDF independiente."""
+    output = BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=landscape(letter), topMargin=30, bottomMargin=30)
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle('TitleStyle', parent=styles['Heading2'], alignment=1, fontSize=12, spaceAfter=10)
+    footer_style = ParagraphStyle('FooterStyle', parent=styles['Normal'], fontSize=8, leading=10, italic=True, alignment=1)
+    auth_style = ParagraphStyle('AuthStyle', parent=styles['Normal'], fontSize=10, bold=True, alignment=1, spaceBefore=10)
+
+    elements = []
+    if nombre_tit is not None:
+        elements.append(Paragraph(f"INSUMOS {nombre_tit} {f_rango}<br/>(PARA LOS 3 TURNOS Y FINES DE SEMANA)", title_style))
+        elements.append(Spacer(1, 10))
+
+        # Ajuste de anchos de columna para landscape (aprox 700 pts totales)
+        col_widths = [45, 60, 180, 45, 40, 70, 110, 110]
+        t = RLTable([columnas] + filas, repeatRows=1, colWidths=col_widths)
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#1F4E78")),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ]))
+        elements.append(t)
+        elements.append(Spacer(1, 15))
+
+        elements.append(Paragraph(LEYENDA_NOM045, footer_style))
+        elements.append(Paragraph(f"<b>{FIRMA_AUTORIZA}</b>", auth_style))
+
+    doc.build(elements)
+    return output.getvalue()
+
+class CacheSecciones:
+    """Páginas PDF ya renderizadas por sección (LRU acotado, compartido por todas las sesiones)."""
+
+    def __init__(self, maximo=MAX_SECCIONES_PDF_EN_CACHE):
+        self.maximo = maximo
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, llave):
+        with self._lock:
+            pdf = self._datos.get(llave)
+            if pdf is not None: self._datos.move_to_end(llave)
+            return pdf
+
+    def put(self, llave, pdf):
+        with self._lock:
+            self._datos[llave] = pdf
+            self._datos.move_to_end(llave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+CACHE_SECCIONES = CacheSecciones()
+
+def _renderizar(pendientes, paralelo=True):
+    """Renderiza {llave: args}; en paralelo si hay más de una sección, en serie si el pool falla."""
+    return dict(zip(pendientes, en_paralelo(_pdf_seccion, pendientes.values(), paralelo)))
+
+@cronometrar("reportes.pdf_insumos")
+def pdf_insumos(df_ais, dict_especialidades, hoy=None, paralelo=True):
+    """PDF oficial de Insumos: AISLAMIENTOS y cada servicio, desde páginas cacheadas por sección.
+
+    Solo se vuelven a renderizar las secciones cuyas filas (o rango de fechas) cambiaron.
+    """
+    f_hoy, f_venc = rango_vigencia(hoy)
+    f_rango = f"DEL {f_hoy} AL {f_venc}"
+
+    secciones = ([("AISLAMIENTOS", df_ais)] if not df_ais.empty else []) + list(dict_especialidades.items())
+    if not secciones:
+        return _pdf_seccion(None, [], [], f_rango)
+
+    llaves, pdfs, pendientes = [], {}, {}
+    for nombre_tit, df in secciones:
+        # Llave de la sección: servicio, rango de fechas, columnas y contenido de las filas
+        llave = huella_df(df, nombre_tit, f_rango)
+        llaves.append(llave)
+        pdf = CACHE_SECCIONES.get(llave)
+        if pdf is not None:
+            pdfs[llave] = pdf
+        elif llave not in pendientes:
+            filas = df.astype(object).where(df.notna(), "").values.tolist()
+            pendientes[llave] = (nombre_tit, df.columns.tolist(), filas, f_rango)
+
+    for llave, pdf in _renderizar(pendientes, paralelo).items():
+        CACHE_SECCIONES.put(llave, pdf)
+        pdfs[llave] = pdf
+
+    writer = PdfWriter()
+    for llave in llaves:
+        writer.append(BytesIO(pdfs[llave]))
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
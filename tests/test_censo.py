@@ -0,0 +1,27 @@
+from io import BytesIO, StringIO
+
+import pandas as pd
+
+from nucleo.censo import iterar_filas, leer_censo
+
+TABLA_ROWSPAN = b"""<html><body><table>
+<tr><th>CAMA</th><th>REGISTRO</th><th>PACIENTE</th><th>SEXO</th><th>EDAD</th></tr>
+<tr><td colspan="5">ESPECIALIDAD: MEDICINA INTERNA</td></tr>
+<tr><td>1101</td><td>1234567</td><td>PEREZ JUAN</td><td rowspan="2">M</td><td>40 ANOS</td></tr>
+<tr><td>1201</td><td>7654321</td><td>LOPEZ ANA</td><td>35 ANOS</td></tr>
+<tr><td rowspan="3">1301</td><td>1111222</td><td colspan="2">GARCIA LUIS</td><td>50 ANOS</td></tr>
+<tr><td>3333444</td><td>RUIZ EVA</td><td>F</td><td>28 ANOS</td></tr>
+<tr><td>5555666</td><td>DIAZ OLGA</td><td>F</td><td>61 ANOS</td></tr>
+</table></body></html>"""
+
+def test_iterar_filas_expande_rowspan_como_read_html():
+    esperado = pd.read_html(StringIO(TABLA_ROWSPAN.decode()))[0].astype(str).values.tolist()
+    filas = [fila for _, fila in iterar_filas(BytesIO(TABLA_ROWSPAN))]
+    assert filas == esperado
+
+def test_leer_censo_con_rowspan_conserva_cama_y_registro():
+    df = leer_censo(TABLA_ROWSPAN)
+    assert df[["CAMA", "REGISTRO"]].values.tolist() == [
+        ["1101", "1234567"], ["1201", "7654321"], ["1301", "1111222"], ["1301", "3333444"], ["1301", "5555666"],
+    ]
+    assert df["SEXO"].tolist() == ["M", "M", "GARCIA LUIS", "F", "F"]
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from nucleo.conciliacion import PESO_NOMBRE, PESO_REGISTRO, UMBRAL_AUTOMATICO, UMBRAL_SUGERENCIA, IndiceCenso
+
+CENSO = pd.DataFrame({
+    "CAMA_HTML": ["1201", "1305", "2210"],
+    "PACIENTE": ["LOPEZ ANA MARIA", "PEREZ JUAN", "GARCIA LUIS"],
+    "REGISTRO": ["7654321", "1234567", "5555666"],
+})
+
+def test_sin_misma_cama_no_llega_al_umbral_automatico():
+    assert PESO_NOMBRE + PESO_REGISTRO < UMBRAL_AUTOMATICO
+    # Nombre y REGISTRO idénticos, otra cama: solo sugerencia
+    pos, puntaje = IndiceCenso(CENSO).mejor("9999", "LOPEZ ANA MARIA", "7654321")
+    assert pos == 0
+    assert UMBRAL_SUGERENCIA <= puntaje < UMBRAL_AUTOMATICO
+
+def test_nombre_identico_y_misma_cama_llena_solo():
+    pos, puntaje = IndiceCenso(CENSO).mejor("1201", "LOPEZ ANA MARIA", "")
+    assert pos == 0
+    assert puntaje >= UMBRAL_AUTOMATICO
+
+def test_conciliar_normaliza_acentos_y_marca_puntaje():
+    res = IndiceCenso(CENSO).conciliar(pd.Series(["1305", "4000"]), pd.Series(["pérez juan", "NADIE CONOCIDO"]), pd.Series(["", ""]))
+    assert res["POSICION"].tolist()[0] == 1 and res["PUNTAJE"].iat[0] >= UMBRAL_AUTOMATICO
+    assert res["PUNTAJE"].iat[1] < UMBRAL_SUGERENCIA